@@ -27,7 +27,7 @@ def refresh_expiring_tokens():
         refresh_token_encrypted__isnull=False,
     )
     
-    logger.info(f"Found {expiring_tokens.count()} Jira tokens to refresh")
+    logger.info("Found %s Jira tokens to refresh", expiring_tokens.count())
     
     refreshed = 0
     failed = 0
@@ -57,14 +57,14 @@ def refresh_expiring_tokens():
                 oauth_token.save()
                 
                 refreshed += 1
-                logger.info(f"Refreshed token for user {oauth_token.user.email}")
+                logger.info("Refreshed token for user %s", oauth_token.user.email)
             else:
                 failed += 1
-                logger.error(f"Failed to refresh token for user {oauth_token.user.email}: {response.text}")
+                logger.error("Failed to refresh token for user %s: %s", oauth_token.user.email, response.text)
         
-        except Exception as e:
+        except Exception:
             failed += 1
-            logger.exception(f"Error refreshing token for user {oauth_token.user.email}: {e}")
+            logger.exception("Error refreshing token for user %s", oauth_token.user.email)
     
     return {
         'refreshed': refreshed,
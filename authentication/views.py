@@ -70,7 +70,7 @@ class GitHubCallbackView(views.APIView):
             token_data = token_response.json()
             
             if 'error' in token_data:
-                logger.error(f"GitHub OAuth error: {token_data}")
+                logger.error("GitHub OAuth error: %s", token_data)
                 return redirect(f"{settings.FRONTEND_URL}/settings?error=github_auth_failed")
             
             access_token = token_data.get('access_token')
@@ -98,8 +98,8 @@ class GitHubCallbackView(views.APIView):
             
             return redirect(f"{settings.FRONTEND_URL}/settings?github=connected&user_id={user.id}")
         
-        except Exception as e:
-            logger.exception(f"GitHub callback error: {e}")
+        except Exception:
+            logger.exception("GitHub callback error")
             return redirect(f"{settings.FRONTEND_URL}/settings?error=github_auth_failed")
 
 
@@ -173,7 +173,7 @@ class JiraCallbackView(views.APIView):
             token_data = token_response.json()
             
             if 'error' in token_data:
-                logger.error(f"Jira OAuth error: {token_data}")
+                logger.error("Jira OAuth error: %s", token_data)
                 return redirect(f"{settings.FRONTEND_URL}/settings?error=jira_auth_failed")
             
             access_token = token_data.get('access_token')
@@ -211,8 +211,8 @@ class JiraCallbackView(views.APIView):
             
             return redirect(f"{settings.FRONTEND_URL}/settings?jira=connected&user_id={user.id}")
         
-        except Exception as e:
-            logger.exception(f"Jira callback error: {e}")
+        except Exception:
+            logger.exception("Jira callback error")
             return redirect(f"{settings.FRONTEND_URL}/settings?error=jira_auth_failed")
 
 
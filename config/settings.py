@@ -190,6 +190,25 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
+# Cache (shared through Redis when available, per-process otherwise).
+# Set REDIS_URL wherever Celery workers run: the weekly report task's
+# per-user lock only spans processes through a shared cache.
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Encryption Key for tokens
 ENCRYPTION_KEY = os.getenv('ENCRYPTION_KEY', '')
 
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['user', 'key'], name='ticket_user_key_idx'),
+        ),
+    ]
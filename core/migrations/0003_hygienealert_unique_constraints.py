@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:50
+
+from django.db import migrations, models
+
+
+def delete_duplicate_alerts(apps, schema_editor):
+    """Keep the oldest alert per (user, type, target, range) before adding the constraints."""
+    HygieneAlert = apps.get_model('core', 'HygieneAlert')
+    seen = set()
+    duplicate_ids = []
+    for alert in HygieneAlert.objects.order_by('created_at').values(
+        'id', 'user_id', 'alert_type', 'ticket_id', 'commit_id',
+        'detected_for_start', 'detected_for_end',
+    ):
+        for target in ('ticket_id', 'commit_id'):
+            if alert[target] is None:
+                continue
+            key = (
+                target, alert['user_id'], alert['alert_type'], alert[target],
+                alert['detected_for_start'], alert['detected_for_end'],
+            )
+            if key in seen:
+                duplicate_ids.append(alert['id'])
+                break
+            seen.add(key)
+    HygieneAlert.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_ticket_user_key_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_alerts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='hygienealert',
+            constraint=models.UniqueConstraint(condition=models.Q(('ticket__isnull', False)), fields=('user', 'alert_type', 'ticket', 'detected_for_start', 'detected_for_end'), name='hygiene_alert_ticket_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='hygienealert',
+            constraint=models.UniqueConstraint(condition=models.Q(('commit__isnull', False)), fields=('user', 'alert_type', 'commit', 'detected_for_start', 'detected_for_end'), name='hygiene_alert_commit_uniq'),
+        ),
+    ]
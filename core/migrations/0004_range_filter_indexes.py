@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_hygienealert_unique_constraints'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='commit',
+            index=models.Index(fields=['user', 'committed_at'], name='commit_user_committed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='commit',
+            index=models.Index(fields=['user', 'ticket', 'committed_at'], name='commit_user_ticket_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticketactivity',
+            index=models.Index(fields=['user', 'activity_at'], name='activity_user_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='worklog',
+            index=models.Index(fields=['user', 'started_at'], name='worklog_user_started_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_range_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='weeklyreport',
+            index=models.Index(fields=['user', '-end_date'], name='weekly_report_user_end_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0005_weekly_report_user_end_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_active', True), models.Q(('github_connected', True), ('jira_connected', True), _connector='OR')), fields=['id'], name='user_integrated_idx'),
+        ),
+    ]
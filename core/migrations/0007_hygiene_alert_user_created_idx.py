@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_user_integrated_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hygienealert',
+            index=models.Index(fields=['user', '-created_at'], name='hygiene_alert_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_hygiene_alert_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportDataVersion',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='report_data_version', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'report_data_versions',
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_report_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='weeklyreport',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_weeklyreport_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='weeklyreport',
+            name='is_synced',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_weeklyreport_is_synced'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='weeklyreport',
+            name='weekly_report_user_end_idx',
+        ),
+    ]
@@ -21,6 +21,16 @@ class User(AbstractUser):
 
     class Meta:
         db_table = 'users'
+        indexes = [
+            # Users the weekly report job runs for
+            models.Index(
+                fields=['id'],
+                condition=models.Q(is_active=True) & (
+                    models.Q(github_connected=True) | models.Q(jira_connected=True)
+                ),
+                name='user_integrated_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.email
@@ -121,6 +131,9 @@ class Ticket(models.Model):
     class Meta:
         db_table = 'tickets'
         unique_together = ['user', 'jira_id']
+        indexes = [
+            models.Index(fields=['user', 'key'], name='ticket_user_key_idx'),
+        ]
 
     def __str__(self):
         return f"{self.key}: {self.title}"
@@ -149,6 +162,10 @@ class Commit(models.Model):
         db_table = 'commits'
         unique_together = ['user', 'repository', 'sha']
         ordering = ['-committed_at']
+        indexes = [
+            models.Index(fields=['user', 'committed_at'], name='commit_user_committed_idx'),
+            models.Index(fields=['user', 'ticket', 'committed_at'], name='commit_user_ticket_idx'),
+        ]
 
     def __str__(self):
         return f"{self.sha[:7]}: {self.message[:50]}"
@@ -187,6 +204,9 @@ class TicketActivity(models.Model):
     class Meta:
         db_table = 'ticket_activities'
         ordering = ['-activity_at']
+        indexes = [
+            models.Index(fields=['user', 'activity_at'], name='activity_user_at_idx'),
+        ]
 
     def __str__(self):
         return f"{self.ticket.key} - {self.activity_type}"
@@ -209,6 +229,9 @@ class Worklog(models.Model):
         db_table = 'worklogs'
         unique_together = ['user', 'jira_id']
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['user', 'started_at'], name='worklog_user_started_idx'),
+        ]
 
     def __str__(self):
         return f"{self.ticket.key} - {self.time_spent_display}"
@@ -235,8 +258,10 @@ class WeeklyReport(models.Model):
     
     # Data snapshot
     report_data = models.JSONField()  # Full report data
+    is_synced = models.BooleanField(default=False)  # Generated right after a GitHub/Jira sync
     
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'weekly_reports'
@@ -281,6 +306,35 @@ class HygieneAlert(models.Model):
     class Meta:
         db_table = 'hygiene_alerts'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='hygiene_alert_user_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'alert_type', 'ticket', 'detected_for_start', 'detected_for_end'],
+                condition=models.Q(ticket__isnull=False),
+                name='hygiene_alert_ticket_uniq',
+            ),
+            models.UniqueConstraint(
+                fields=['user', 'alert_type', 'commit', 'detected_for_start', 'detected_for_end'],
+                condition=models.Q(commit__isnull=False),
+                name='hygiene_alert_commit_uniq',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.alert_type}: {self.title}"
+
+
+class ReportDataVersion(models.Model):
+    """Per-user counter bumped whenever data that reports are built from changes."""
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name='report_data_version'
+    )
+    version = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'report_data_versions'
+
+    def __str__(self):
+        return f"{self.user.email} - v{self.version}"
@@ -1,3 +1,124 @@
-from django.test import TestCase
+from datetime import datetime, timezone as dt_timezone
 
-# Create your tests here.
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+from core.models import User, Repository
+from core.utils import (
+    bump_report_cache_version, get_report_cache_version, report_cache_key,
+    update_or_create_if_changed,
+)
+
+
+class ReportCacheVersionTests(TestCase):
+    """Per-user report cache versions."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='dev@local.dev', username='dev')
+        self.other = User.objects.create(email='other@local.dev', username='other')
+        self.since = datetime(2026, 10, 12, tzinfo=dt_timezone.utc)
+        self.until = datetime(2026, 10, 18, tzinfo=dt_timezone.utc)
+
+    def test_version_starts_at_zero(self):
+        self.assertEqual(get_report_cache_version(self.user), 0)
+
+    def test_bump_increments_only_that_users_version(self):
+        bump_report_cache_version(self.user)
+        bump_report_cache_version(self.user)
+
+        self.assertEqual(get_report_cache_version(self.user), 2)
+        self.assertEqual(get_report_cache_version(self.other), 0)
+
+    def test_bump_changes_report_cache_key(self):
+        before = report_cache_key(self.user, 'report', self.since, self.until)
+        bump_report_cache_version(self.user)
+        after = report_cache_key(self.user, 'report', self.since, self.until)
+
+        self.assertNotEqual(before, after)
+
+
+class UpdateOrCreateIfChangedTests(TestCase):
+    """update_or_create_if_changed reports whether a row moved."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='dev@local.dev', username='dev')
+        self.defaults = {
+            'user': self.user, 'name': 'repo', 'full_name': 'org/repo',
+            'url': 'https://github.com/org/repo',
+        }
+
+    def test_create_then_unchanged_then_changed(self):
+        _, created = update_or_create_if_changed(Repository, dict(self.defaults), github_id=1)
+        _, unchanged = update_or_create_if_changed(Repository, dict(self.defaults), github_id=1)
+        repository, changed = update_or_create_if_changed(
+            Repository, {**self.defaults, 'name': 'renamed'}, github_id=1
+        )
+
+        self.assertEqual((created, unchanged, changed), (True, False, True))
+        repository.refresh_from_db()
+        self.assertEqual(repository.name, 'renamed')
+
+
+class DeleteDuplicateAlertsMigrationTests(TransactionTestCase):
+    """0003_hygienealert_unique_constraints removes duplicate alerts first."""
+
+    migrate_from = [('core', '0002_ticket_user_key_idx')]
+    migrate_to = [('core', '0003_hygienealert_unique_constraints')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        self.apps = executor.loader.project_state(self.migrate_from).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def _migrate(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.migrate_to)
+
+    def test_keeps_oldest_alert_per_target(self):
+        User = self.apps.get_model('core', 'User')
+        Repository = self.apps.get_model('core', 'Repository')
+        Commit = self.apps.get_model('core', 'Commit')
+        HygieneAlert = self.apps.get_model('core', 'HygieneAlert')
+
+        user = User.objects.create(email='dev@local.dev', username='dev')
+        repository = Repository.objects.create(
+            user=user, github_id=1, name='repo', full_name='org/repo',
+            url='https://github.com/org/repo',
+        )
+        commits = [
+            Commit.objects.create(
+                user=user, repository=repository, sha=sha * 40, message='fix',
+                author_name='dev', author_email='dev@local.dev',
+                url='https://github.com/org/repo/commit/' + sha,
+                committed_at=datetime(2026, 10, 14, 12, 0, tzinfo=dt_timezone.utc),
+            )
+            for sha in ('a', 'b')
+        ]
+
+        def create_alert(commit, created_at):
+            alert = HygieneAlert.objects.create(
+                user=user, alert_type='commit_no_ticket', commit=commit,
+                title='Commit without ticket', description='', recommendation='',
+                detected_for_start=datetime(2026, 10, 12).date(),
+                detected_for_end=datetime(2026, 10, 18).date(),
+            )
+            HygieneAlert.objects.filter(id=alert.id).update(created_at=created_at)
+            return alert.id
+
+        oldest = create_alert(commits[0], datetime(2026, 10, 13, tzinfo=dt_timezone.utc))
+        create_alert(commits[0], datetime(2026, 10, 14, tzinfo=dt_timezone.utc))
+        create_alert(commits[0], datetime(2026, 10, 15, tzinfo=dt_timezone.utc))
+        other_commit = create_alert(commits[1], datetime(2026, 10, 14, tzinfo=dt_timezone.utc))
+
+        self._migrate()
+
+        self.assertEqual(
+            set(HygieneAlert.objects.values_list('id', flat=True)),
+            {oldest, other_commit},
+        )
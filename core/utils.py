@@ -3,7 +3,9 @@ Utility functions for the application.
 """
 
 import uuid
-from core.models import User
+from django.db.models import F
+
+from core.models import User, ReportDataVersion
 
 
 def get_or_create_session_user(request):
@@ -41,3 +43,69 @@ def get_or_create_session_user(request):
     
     request.session['user_id'] = str(user.id)
     return user
+
+
+# Seconds a generated report or analytics summary stays cached
+REPORT_CACHE_TIMEOUT = 900
+
+
+def get_report_cache_version(user) -> int:
+    """
+    Get the current version of the user's cached reports.
+    
+    Kept in the database rather than the cache so every web and Celery
+    process sees the same version, whichever cache backend is configured.
+    """
+    version = ReportDataVersion.objects.filter(user=user).values_list(
+        'version', flat=True
+    ).first()
+    return version or 0
+
+
+def bump_report_cache_version(user) -> None:
+    """
+    Invalidate the user's cached reports.
+    
+    Call after anything a report is built from changes (synced commits,
+    tickets, worklogs or hygiene alerts).
+    """
+    updated = ReportDataVersion.objects.filter(user=user).update(version=F('version') + 1)
+    if not updated:
+        ReportDataVersion.objects.get_or_create(user=user, defaults={'version': 1})
+
+
+def report_cache_key(user, name: str, since, until) -> str:
+    """Cache key for a report or summary, scoped to the user's data version."""
+    version = get_report_cache_version(user)
+    return f"{name}:{user.id}:{version}:{since.isoformat()}:{until.isoformat()}"
+
+
+def update_or_create_if_changed(model, defaults: dict, **lookup):
+    """
+    Like update_or_create, but only writes fields whose values changed.
+    
+    Returns (obj, changed), where changed is True when the row was created
+    or updated, so syncs can tell whether report data actually moved.
+    """
+    obj, created = model.objects.get_or_create(defaults=defaults, **lookup)
+    if created:
+        return obj, True
+    
+    changed_fields = []
+    for name, value in defaults.items():
+        field = model._meta.get_field(name)
+        # Compare foreign keys by id so unchanged relations aren't loaded
+        if field.is_relation:
+            name, value = field.attname, getattr(value, 'pk', value)
+        if getattr(obj, name) != value:
+            setattr(obj, name, value)
+            changed_fields.append(name)
+    
+    if changed_fields:
+        # auto_now columns only refresh when they're in update_fields
+        changed_fields.extend(
+            f.name for f in model._meta.concrete_fields if getattr(f, 'auto_now', False)
+        )
+        obj.save(update_fields=changed_fields)
+    
+    return obj, bool(changed_fields)
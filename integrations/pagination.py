@@ -0,0 +1,17 @@
+"""
+Pagination classes for integration list endpoints.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class CommitCursorPagination(CursorPagination):
+    """Cursor pagination for commits, newest first (no COUNT query)."""
+    page_size = 50
+    ordering = '-committed_at'
+
+
+class TicketCursorPagination(CursorPagination):
+    """Cursor pagination for tickets, most recently updated first."""
+    page_size = 50
+    ordering = '-updated_at_jira'
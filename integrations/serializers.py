@@ -63,6 +63,9 @@ class TicketSerializer(serializers.ModelSerializer):
         ]
     
     def get_commits_count(self, obj):
+        # Ticket views annotate the count to avoid a query per ticket
+        if hasattr(obj, 'commits_count'):
+            return obj.commits_count
         return obj.commits.count()
 
 
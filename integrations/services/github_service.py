@@ -10,6 +10,7 @@ import requests
 from django.utils import timezone
 
 from core.models import User, OAuthToken, Repository, Commit, Ticket
+from core.utils import bump_report_cache_version, update_or_create_if_changed
 from authentication.encryption import decrypt_token
 
 logger = logging.getLogger(__name__)
@@ -24,6 +25,8 @@ class GitHubService:
     def __init__(self, user: User):
         self.user = user
         self._access_token = None
+        # Set when a sync creates or changes commits
+        self.data_changed = False
     
     def _get_access_token(self) -> str:
         """Get decrypted access token for the user."""
@@ -198,7 +201,8 @@ class GitHubService:
             # Get commit stats if available
             stats = commit_data.get('stats', {})
             
-            commit_obj, created = Commit.objects.update_or_create(
+            commit_obj, changed = update_or_create_if_changed(
+                Commit,
                 user=self.user,
                 repository=repository,
                 sha=commit_data['sha'],
@@ -216,6 +220,7 @@ class GitHubService:
                     'is_unlinked': is_unlinked,
                 }
             )
+            self.data_changed |= changed
             synced_commits.append(commit_obj)
         
         # Update repository last synced timestamp
@@ -275,4 +280,8 @@ class GitHubService:
                 logger.error(f"Error syncing {repo.full_name}: {e}")
                 results[repo.full_name] = []
         
+        # A sync that found nothing new keeps cached reports valid
+        if self.data_changed:
+            bump_report_cache_version(self.user)
+        
         return results
@@ -3,8 +3,9 @@ Jira integration service for fetching tickets, activities, and worklogs.
 """
 
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Iterator, Optional, Any
 import requests
 from django.utils import timezone
 from django.conf import settings
@@ -13,20 +14,31 @@ from core.models import (
     User, OAuthToken, JiraProject, Ticket, 
     TicketActivity, Worklog
 )
+from core.utils import bump_report_cache_version, update_or_create_if_changed
 from authentication.encryption import decrypt_token, encrypt_token
 
 logger = logging.getLogger(__name__)
 
 
+class JiraAuthenticationError(ValueError):
+    """Jira rejected the access token (HTTP 401)."""
+
+
 class JiraService:
     """Service for interacting with Jira API."""
     
     BASE_URL = 'https://api.atlassian.com/ex/jira'
+    # Concurrent per-issue detail requests during a sync
+    FETCH_WORKERS = 8
+    # Tokens this close to expiry are refreshed before use
+    TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
     
     def __init__(self, user: User):
         self.user = user
         self._access_token = None
         self._cloud_id = None
+        # Set when a sync creates or changes tickets, activities or worklogs
+        self.data_changed = False
     
     def _get_oauth_token(self) -> OAuthToken:
         """Get OAuth token record for the user."""
@@ -37,10 +49,12 @@ class JiraService:
     
     def _get_access_token(self) -> str:
         """Get decrypted access token, refreshing if needed."""
-        oauth_token = self._get_oauth_token()
-        
-        # Check if token needs refresh
-        if oauth_token.expires_at and oauth_token.expires_at <= timezone.now():
+        return self._fresh_access_token(self._get_oauth_token())
+    
+    def _fresh_access_token(self, oauth_token: OAuthToken, force: bool = False) -> str:
+        """Get decrypted access token, refreshing it if forced or about to expire."""
+        expires_at = oauth_token.expires_at
+        if force or (expires_at and expires_at <= timezone.now() + self.TOKEN_REFRESH_MARGIN):
             self._refresh_token(oauth_token)
         
         if not self._access_token:
@@ -96,13 +110,18 @@ class JiraService:
         method: str = 'GET', 
         params: dict = None,
         json_data: dict = None,
+        access_token: str = None,
     ) -> Any:
-        """Make authenticated request to Jira API."""
+        """
+        Make authenticated request to Jira API.
+        
+        Pass an already resolved access_token to skip the token lookup.
+        """
         cloud_id = self._get_cloud_id()
         url = f"{self.BASE_URL}/{cloud_id}{endpoint}"
         
         headers = {
-            'Authorization': f'Bearer {self._get_access_token()}',
+            'Authorization': f'Bearer {access_token or self._get_access_token()}',
             'Accept': 'application/json',
             'Content-Type': 'application/json',
         }
@@ -112,7 +131,7 @@ class JiraService:
         )
         
         if response.status_code == 401:
-            raise ValueError("Jira authentication failed")
+            raise JiraAuthenticationError("Jira authentication failed")
         
         response.raise_for_status()
         
@@ -199,12 +218,13 @@ class JiraService:
         
         return all_issues
     
-    def get_issue_by_key(self, issue_key: str) -> Optional[Dict]:
+    def get_issue_by_key(self, issue_key: str, access_token: str = None) -> Optional[Dict]:
         """Get a single issue by key."""
         try:
             return self._make_request(
                 f'/rest/api/3/issue/{issue_key}',
-                params={'expand': 'changelog'}
+                params={'expand': 'changelog'},
+                access_token=access_token,
             )
         except requests.HTTPError as e:
             if e.response.status_code == 404:
@@ -237,7 +257,8 @@ class JiraService:
         site_url = f"https://{self.user.email.split('@')[0]}.atlassian.net"
         issue_url = f"{site_url}/browse/{issue_data.get('key')}"
         
-        ticket, created = Ticket.objects.update_or_create(
+        ticket, changed = update_or_create_if_changed(
+            Ticket,
             user=self.user,
             jira_id=issue_data['id'],
             defaults={
@@ -255,6 +276,7 @@ class JiraService:
                 'updated_at_jira': updated_at,
             }
         )
+        self.data_changed |= changed
         
         return ticket
     
@@ -286,9 +308,11 @@ class JiraService:
         ticket: Ticket,
         since: datetime,
         until: datetime,
+        issue_data: Optional[Dict] = None,
     ) -> List[TicketActivity]:
         """Sync activities (status changes, comments) for a ticket."""
-        issue_data = self.get_issue_by_key(ticket.key)
+        if issue_data is None:
+            issue_data = self.get_issue_by_key(ticket.key)
         if not issue_data:
             return []
         
@@ -315,7 +339,8 @@ class JiraService:
                 else:
                     activity_type = 'field_change'
                 
-                activity, created = TicketActivity.objects.update_or_create(
+                activity, changed = update_or_create_if_changed(
+                    TicketActivity,
                     user=self.user,
                     ticket=ticket,
                     jira_id=f"{history['id']}_{item.get('fieldId', field)}",
@@ -330,6 +355,7 @@ class JiraService:
                         'activity_at': created_at,
                     }
                 )
+                self.data_changed |= changed
                 activities.append(activity)
         
         # Process comments
@@ -344,7 +370,8 @@ class JiraService:
             if not (since <= created_at <= until):
                 continue
             
-            activity, created = TicketActivity.objects.update_or_create(
+            activity, changed = update_or_create_if_changed(
+                TicketActivity,
                 user=self.user,
                 ticket=ticket,
                 jira_id=comment['id'],
@@ -355,13 +382,16 @@ class JiraService:
                     'activity_at': created_at,
                 }
             )
+            self.data_changed |= changed
             activities.append(activity)
         
         return activities
     
-    def get_worklogs(self, issue_key: str) -> List[Dict]:
+    def get_worklogs(self, issue_key: str, access_token: str = None) -> List[Dict]:
         """Get worklogs for an issue."""
-        response = self._make_request(f'/rest/api/3/issue/{issue_key}/worklog')
+        response = self._make_request(
+            f'/rest/api/3/issue/{issue_key}/worklog', access_token=access_token
+        )
         return response.get('worklogs', [])
     
     def sync_worklogs(
@@ -369,9 +399,11 @@ class JiraService:
         ticket: Ticket,
         since: datetime,
         until: datetime,
+        worklogs_data: Optional[List[Dict]] = None,
     ) -> List[Worklog]:
         """Sync worklogs for a ticket within a date range."""
-        worklogs_data = self.get_worklogs(ticket.key)
+        if worklogs_data is None:
+            worklogs_data = self.get_worklogs(ticket.key)
         worklogs = []
         
         for worklog_data in worklogs_data:
@@ -383,7 +415,8 @@ class JiraService:
             if not (since <= started_at <= until):
                 continue
             
-            worklog, created = Worklog.objects.update_or_create(
+            worklog, changed = update_or_create_if_changed(
+                Worklog,
                 user=self.user,
                 jira_id=worklog_data['id'],
                 defaults={
@@ -395,10 +428,68 @@ class JiraService:
                     'started_at': started_at,
                 }
             )
+            self.data_changed |= changed
             worklogs.append(worklog)
         
         return worklogs
     
+    def _fetch_issue_details(self, issue_key: str, access_token: str) -> tuple:
+        """Fetch changelog and worklogs for an issue on a worker thread."""
+        return (
+            self.get_issue_by_key(issue_key, access_token=access_token),
+            self.get_worklogs(issue_key, access_token=access_token),
+        )
+    
+    def iter_issue_details(self, issues_data: List[Dict]) -> Iterator[tuple]:
+        """
+        Yield (issue_data, issue, worklogs) as their concurrent fetches finish.
+        
+        The token and cloud ID are resolved here, so the workers make no
+        database queries and never refresh the token concurrently. The token
+        is refreshed between submissions when it is about to expire, and an
+        issue whose fetch is rejected with a 401 is retried once with a
+        refreshed token. At most twice FETCH_WORKERS fetches are in flight
+        or waiting at a time.
+        """
+        if not issues_data:
+            return
+        
+        self._get_cloud_id()
+        oauth_token = self._get_oauth_token()
+        retried = set()
+        
+        with ThreadPoolExecutor(max_workers=self.FETCH_WORKERS) as executor:
+            in_flight = {}
+            
+            def submit(issue_data, access_token):
+                future = executor.submit(
+                    self._fetch_issue_details, issue_data.get('key'), access_token
+                )
+                in_flight[future] = (issue_data, access_token)
+            
+            def drain(limit):
+                while len(in_flight) > limit:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        issue_data, access_token = in_flight.pop(future)
+                        try:
+                            issue, worklogs = future.result()
+                        except JiraAuthenticationError:
+                            if issue_data.get('key') in retried:
+                                raise
+                            retried.add(issue_data.get('key'))
+                            # Fetches that used the same expired token share one refresh
+                            force = access_token == self._access_token
+                            submit(issue_data, self._fresh_access_token(oauth_token, force=force))
+                            continue
+                        yield issue_data, issue, worklogs
+            
+            for issue_data in issues_data:
+                submit(issue_data, self._fresh_access_token(oauth_token))
+                yield from drain(self.FETCH_WORKERS * 2 - 1)
+            
+            yield from drain(0)
+    
     def sync_all_for_date_range(
         self,
         since: datetime,
@@ -425,17 +516,20 @@ class JiraService:
         all_activities = []
         all_worklogs = []
         
-        for issue_data in issues_data:
+        # The per-issue API calls are independent, so run them concurrently
+        for issue_data, full_issue, worklogs_data in self.iter_issue_details(issues_data):
             # Sync ticket
             ticket = self.sync_ticket(issue_data)
             all_tickets.append(ticket)
             
             # Sync activities
-            activities = self.sync_ticket_activities(ticket, since, until)
+            activities = self.sync_ticket_activities(
+                ticket, since, until, issue_data=full_issue or {}
+            )
             all_activities.extend(activities)
             
             # Sync worklogs
-            worklogs = self.sync_worklogs(ticket, since, until)
+            worklogs = self.sync_worklogs(ticket, since, until, worklogs_data=worklogs_data)
             all_worklogs.extend(worklogs)
         
         # Update project sync timestamps
@@ -443,6 +537,10 @@ class JiraService:
             last_synced_at=timezone.now()
         )
         
+        # A sync that found nothing new keeps cached reports valid
+        if self.data_changed:
+            bump_report_cache_version(self.user)
+        
         logger.info(
             f"Synced {len(all_tickets)} tickets, "
             f"{len(all_activities)} activities, "
@@ -1,3 +1,107 @@
+import threading
+from datetime import timedelta
+from unittest.mock import patch
+
 from django.test import TestCase
+from django.utils import timezone
+
+from authentication.encryption import encrypt_token
+from core.models import User, OAuthToken
+from integrations.services import JiraService
+
+
+class FakeResponse:
+    """Stand-in for a requests.Response carrying JSON data."""
+
+    content = b'{}'
+
+    def __init__(self, data, status_code=200):
+        self._data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class FakeJira:
+    """Answers issue and worklog requests, accepting a single valid token."""
+
+    def __init__(self, valid_token):
+        self.valid_token = valid_token
+        self.tokens_seen = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, params=None, json=None):
+        token = headers['Authorization'].removeprefix('Bearer ')
+        with self._lock:
+            self.tokens_seen.append(token)
+        if token != self.valid_token:
+            return FakeResponse({}, status_code=401)
+
+        key = url.split('/issue/')[1].split('/')[0]
+        if url.endswith('/worklog'):
+            return FakeResponse({'worklogs': [{'id': f'{key}-w'}]})
+        return FakeResponse({'key': key})
+
+
+class IterIssueDetailsTests(TestCase):
+    """Concurrent Jira issue detail fetches."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='dev@local.dev', username='dev', jira_connected=True)
+        self.oauth_token = OAuthToken.objects.create(
+            user=self.user, provider='jira', cloud_id='cloud',
+            access_token_encrypted=encrypt_token('old'),
+            refresh_token_encrypted=encrypt_token('refresh'),
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        self.issues = [{'key': f'PROJ-{i}'} for i in range(20)]
+        self.service = JiraService(self.user)
+
+    def _fetch_all(self, jira):
+        refreshed = FakeResponse({'access_token': 'new', 'expires_in': 3600})
+        with patch(
+            'integrations.services.jira_service.requests.request', side_effect=jira.request
+        ), patch(
+            'integrations.services.jira_service.requests.post', return_value=refreshed
+        ) as refresh:
+            results = list(self.service.iter_issue_details(self.issues))
+        return results, refresh
+
+    def test_fetches_every_issue(self):
+        jira = FakeJira(valid_token='old')
+
+        results, refresh = self._fetch_all(jira)
+
+        self.assertCountEqual([issue_data['key'] for issue_data, _, _ in results], [
+            issue['key'] for issue in self.issues
+        ])
+        for issue_data, issue, worklogs in results:
+            self.assertEqual(issue['key'], issue_data['key'])
+            self.assertEqual(worklogs, [{'id': f"{issue_data['key']}-w"}])
+        refresh.assert_not_called()
+
+    def test_rejected_token_is_refreshed_once_and_retried(self):
+        # The token is revoked server side before its recorded expiry
+        jira = FakeJira(valid_token='new')
+
+        results, refresh = self._fetch_all(jira)
+
+        self.assertEqual(len(results), len(self.issues))
+        refresh.assert_called_once()
+        self.oauth_token.refresh_from_db()
+        self.assertGreater(self.oauth_token.expires_at, timezone.now() + timedelta(minutes=30))
+
+    def test_token_near_expiry_is_refreshed_before_fetching(self):
+        self.oauth_token.expires_at = timezone.now() + timedelta(minutes=1)
+        self.oauth_token.save()
+        jira = FakeJira(valid_token='new')
+
+        results, refresh = self._fetch_all(jira)
 
-# Create your tests here.
+        self.assertEqual(len(results), len(self.issues))
+        refresh.assert_called_once()
+        self.assertEqual(set(jira.tokens_seen), {'new'})
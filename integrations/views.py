@@ -2,14 +2,17 @@
 API views for GitHub and Jira integrations.
 """
 
+import functools
 import logging
 from datetime import datetime
+from django.db.models import Count
 from rest_framework import status, views, generics
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
 from core.models import Repository, JiraProject, Commit, Ticket
 from core.utils import get_or_create_session_user
+from .pagination import CommitCursorPagination, TicketCursorPagination
 from .serializers import (
     RepositorySerializer, JiraProjectSerializer, 
     CommitSerializer, TicketSerializer, SyncRequestSerializer
@@ -19,6 +22,31 @@ from .services import GitHubService, JiraService
 logger = logging.getLogger(__name__)
 
 
+def handle_integration_errors(error_message: str):
+    """
+    Map integration failures in a view handler to JSON error responses.
+    
+    ValueError (missing or rejected OAuth credentials) becomes a 400 with the
+    exception text; any other exception is logged and becomes a 500 with
+    error_message.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            try:
+                return handler(self, request, *args, **kwargs)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            except Exception:
+                logger.exception("%s in %s", error_message, type(self).__name__)
+                return Response(
+                    {'error': error_message},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+        return wrapper
+    return decorator
+
+
 # ==================== GitHub Views ====================
 
 class GitHubRepositoriesView(generics.ListAPIView):
@@ -35,6 +63,7 @@ class GitHubSyncRepositoriesView(views.APIView):
     """Sync repositories from GitHub."""
     permission_classes = [AllowAny]
     
+    @handle_integration_errors('Failed to sync repositories')
     def post(self, request):
         user = get_or_create_session_user(request)
         
@@ -44,21 +73,12 @@ class GitHubSyncRepositoriesView(views.APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            service = GitHubService(user)
-            repos = service.sync_repositories()
-            return Response({
-                'message': f'Synced {len(repos)} repositories',
-                'repositories': RepositorySerializer(repos, many=True).data
-            })
-        except ValueError as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            logger.exception(f"Error syncing repositories: {e}")
-            return Response(
-                {'error': 'Failed to sync repositories'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        service = GitHubService(user)
+        repos = service.sync_repositories()
+        return Response({
+            'message': f'Synced {len(repos)} repositories',
+            'repositories': RepositorySerializer(repos, many=True).data
+        })
 
 
 class GitHubToggleTrackingView(views.APIView):
@@ -83,6 +103,7 @@ class GitHubSyncCommitsView(views.APIView):
     """Sync commits from GitHub for a date range."""
     permission_classes = [AllowAny]
     
+    @handle_integration_errors('Failed to sync commits')
     def post(self, request):
         serializer = SyncRequestSerializer(data=request.data)
         if not serializer.is_valid():
@@ -96,35 +117,27 @@ class GitHubSyncCommitsView(views.APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            service = GitHubService(user)
-            since = serializer.validated_data['since']
-            until = serializer.validated_data['until']
-            
-            results = service.sync_all_tracked_repos(since, until)
-            
-            total_commits = sum(len(commits) for commits in results.values())
-            
-            return Response({
-                'message': f'Synced {total_commits} commits from {len(results)} repositories',
-                'by_repository': {
-                    repo: len(commits) for repo, commits in results.items()
-                }
-            })
-        except ValueError as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            logger.exception(f"Error syncing commits: {e}")
-            return Response(
-                {'error': 'Failed to sync commits'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        service = GitHubService(user)
+        since = serializer.validated_data['since']
+        until = serializer.validated_data['until']
+        
+        results = service.sync_all_tracked_repos(since, until)
+        
+        total_commits = sum(len(commits) for commits in results.values())
+        
+        return Response({
+            'message': f'Synced {total_commits} commits from {len(results)} repositories',
+            'by_repository': {
+                repo: len(commits) for repo, commits in results.items()
+            }
+        })
 
 
 class CommitsListView(generics.ListAPIView):
     """List commits with optional filters."""
     permission_classes = [AllowAny]
     serializer_class = CommitSerializer
+    pagination_class = CommitCursorPagination
     
     def get_queryset(self):
         user = get_or_create_session_user(self.request)
@@ -168,6 +181,7 @@ class JiraSyncProjectsView(views.APIView):
     """Sync projects from Jira."""
     permission_classes = [AllowAny]
     
+    @handle_integration_errors('Failed to sync projects')
     def post(self, request):
         user = get_or_create_session_user(request)
         
@@ -177,21 +191,12 @@ class JiraSyncProjectsView(views.APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            service = JiraService(user)
-            projects = service.sync_projects()
-            return Response({
-                'message': f'Synced {len(projects)} projects',
-                'projects': JiraProjectSerializer(projects, many=True).data
-            })
-        except ValueError as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            logger.exception(f"Error syncing projects: {e}")
-            return Response(
-                {'error': 'Failed to sync projects'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        service = JiraService(user)
+        projects = service.sync_projects()
+        return Response({
+            'message': f'Synced {len(projects)} projects',
+            'projects': JiraProjectSerializer(projects, many=True).data
+        })
 
 
 class JiraToggleTrackingView(views.APIView):
@@ -216,6 +221,7 @@ class JiraSyncDataView(views.APIView):
     """Sync Jira data (tickets, activities, worklogs) for a date range."""
     permission_classes = [AllowAny]
     
+    @handle_integration_errors('Failed to sync Jira data')
     def post(self, request):
         serializer = SyncRequestSerializer(data=request.data)
         if not serializer.is_valid():
@@ -229,34 +235,26 @@ class JiraSyncDataView(views.APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            service = JiraService(user)
-            since = serializer.validated_data['since']
-            until = serializer.validated_data['until']
-            project_keys = serializer.validated_data.get('project_keys')
-            
-            results = service.sync_all_for_date_range(since, until, project_keys)
-            
-            return Response({
-                'message': 'Jira data synced successfully',
-                'tickets_synced': len(results['tickets']),
-                'activities_synced': len(results['activities']),
-                'worklogs_synced': len(results['worklogs']),
-            })
-        except ValueError as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            logger.exception(f"Error syncing Jira data: {e}")
-            return Response(
-                {'error': 'Failed to sync Jira data'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        service = JiraService(user)
+        since = serializer.validated_data['since']
+        until = serializer.validated_data['until']
+        project_keys = serializer.validated_data.get('project_keys')
+        
+        results = service.sync_all_for_date_range(since, until, project_keys)
+        
+        return Response({
+            'message': 'Jira data synced successfully',
+            'tickets_synced': len(results['tickets']),
+            'activities_synced': len(results['activities']),
+            'worklogs_synced': len(results['worklogs']),
+        })
 
 
 class TicketsListView(generics.ListAPIView):
     """List tickets with optional filters."""
     permission_classes = [AllowAny]
     serializer_class = TicketSerializer
+    pagination_class = TicketCursorPagination
     
     def get_queryset(self):
         user = get_or_create_session_user(self.request)
@@ -281,7 +279,7 @@ class TicketsListView(generics.ListAPIView):
         if until:
             queryset = queryset.filter(updated_at_jira__lte=until)
         
-        return queryset.select_related('project')
+        return queryset.annotate(commits_count=Count('commits'))
 
 
 class TicketDetailView(generics.RetrieveAPIView):
@@ -292,4 +290,4 @@ class TicketDetailView(generics.RetrieveAPIView):
     
     def get_queryset(self):
         user = get_or_create_session_user(self.request)
-        return Ticket.objects.filter(user=user)
+        return Ticket.objects.filter(user=user).annotate(commits_count=Count('commits'))
@@ -0,0 +1,17 @@
+"""
+Pagination classes for report list endpoints.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class HygieneAlertCursorPagination(CursorPagination):
+    """Cursor pagination for hygiene alerts, newest first (no COUNT query)."""
+    page_size = 50
+    ordering = '-created_at'
+
+
+class WeeklyReportCursorPagination(CursorPagination):
+    """Cursor pagination for weekly reports, latest week first."""
+    page_size = 20
+    ordering = '-start_date'
@@ -2,6 +2,8 @@
 Serializers for report endpoints.
 """
 
+from dataclasses import dataclass
+from datetime import datetime
 from rest_framework import serializers
 from core.models import WeeklyReport, HygieneAlert
 
@@ -49,16 +51,29 @@ class HygieneAlertSerializer(serializers.ModelSerializer):
         return obj.commit.sha[:7] if obj.commit else None
 
 
+@dataclass(frozen=True, slots=True)
+class ReportRequest:
+    """Validated report request parameters."""
+    since: datetime
+    until: datetime
+    sync_first: bool = True
+
+
 class GenerateReportRequestSerializer(serializers.Serializer):
     """Request serializer for report generation."""
     since = serializers.DateTimeField()
     until = serializers.DateTimeField()
     sync_first = serializers.BooleanField(default=True)
+    
+    def to_request(self) -> ReportRequest:
+        """Validated data as a ReportRequest; call after is_valid()."""
+        return ReportRequest(**self.validated_data)
 
 
 class ResolveAlertSerializer(serializers.Serializer):
     """Request serializer for resolving alerts."""
     alert_ids = serializers.ListField(
         child=serializers.UUIDField(),
-        min_length=1
+        min_length=1,
+        max_length=10000
     )
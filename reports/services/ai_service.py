@@ -3,20 +3,105 @@ AI service for generating smart summaries using OpenAI.
 """
 
 import logging
-from typing import Dict, Any
+import threading
+import time
+from typing import Dict, Any, List
+import tiktoken
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+from reports.utils import DONE_STATUSES
 
 logger = logging.getLogger(__name__)
 
+MODEL = "gpt-4o-mini"
+
+# Ticket titles in the summary prompt are capped by tokens, not characters,
+# so long or CJK titles can't blow up the prompt size.
+_TICKET_TITLE_MAX_TOKENS = 16
+
+# Seconds to wait before retrying a failed tokenizer download
+_ENCODING_RETRY_SECONDS = 300
+
+# Kept byte-identical across calls so OpenAI can reuse the cached prompt prefix.
+_SUMMARY_SYSTEM_PROMPT = (
+    "You are a helpful assistant that summarizes developer work activity. "
+    "Be concise, professional, and encouraging."
+)
+
+_SUMMARY_PROMPT_TMPL = """Based on the following developer work data, generate a concise, professional summary paragraph:
+
+Date Range: {start} to {end}
+
+Statistics:
+- Total tickets worked on: {total_tickets}
+- Total commits made: {total_commits}
+- Tickets completed (moved to Done): {tickets_completed}
+- Total time logged: {total_time_logged_display}
+- Unlinked commits (no ticket reference): {unlinked_commits}
+- Non-code activities: {non_code_activities}
+
+Top Tickets Worked On:
+{tickets}
+
+Generate a 2-3 sentence summary that sounds natural and informative. Focus on productivity and accomplishments. Mention any concerns like unlinked commits if they exist."""
+
+_SUMMARY_PROMPT_DEFAULTS = {
+    'start': 'N/A',
+    'end': 'N/A',
+    'total_tickets': 0,
+    'total_commits': 0,
+    'tickets_completed': 0,
+    'total_time_logged_display': '0h',
+    'unlinked_commits': 0,
+    'non_code_activities': 0,
+}
+
+
+_encoding = None
+_encoding_failed_at = None
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """
+    Load the tokenizer for MODEL once per process, or None if unavailable.
+    
+    Only a successful load is kept; after a failure (tiktoken downloads the
+    encoding on first use) the load is retried once _ENCODING_RETRY_SECONDS
+    have passed.
+    """
+    global _encoding, _encoding_failed_at
+    if _encoding is not None:
+        return _encoding
+    
+    with _encoding_lock:
+        if _encoding is None and (
+            _encoding_failed_at is None
+            or time.monotonic() - _encoding_failed_at >= _ENCODING_RETRY_SECONDS
+        ):
+            try:
+                _encoding = tiktoken.encoding_for_model(MODEL)
+            except Exception as e:
+                _encoding_failed_at = time.monotonic()
+                logger.warning(f"Could not load tokenizer for {MODEL}: {e}")
+    return _encoding
+
 
 class AIService:
     """Service for AI-powered summaries and insights."""
     
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    def _client(self) -> AsyncOpenAI:
+        """
+        New OpenAI client for a single call.
+        
+        Callers drive these coroutines through async_to_sync, which runs each
+        call on its own event loop, so a client must not outlive its loop.
+        """
+        return AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
     
-    def generate_work_summary(self, report_data: Dict[str, Any]) -> str:
+    async def generate_work_summary(self, report_data: Dict[str, Any]) -> str:
         """
         Generate a natural language summary of work done.
         
@@ -30,36 +115,25 @@ class AIService:
         stats = report_data.get('stats', {})
         date_range = report_data.get('date_range', {})
         
-        prompt = f"""Based on the following developer work data, generate a concise, professional summary paragraph:
-
-Date Range: {date_range.get('start', 'N/A')} to {date_range.get('end', 'N/A')}
-
-Statistics:
-- Total tickets worked on: {stats.get('total_tickets', 0)}
-- Total commits made: {stats.get('total_commits', 0)}
-- Tickets completed (moved to Done): {stats.get('tickets_completed', 0)}
-- Total time logged: {stats.get('total_time_logged_display', '0h')}
-- Unlinked commits (no ticket reference): {stats.get('unlinked_commits', 0)}
-- Non-code activities: {stats.get('non_code_activities', 0)}
-
-Top Tickets Worked On:
-{self._format_tickets(report_data.get('tickets', [])[:5])}
-
-Generate a 2-3 sentence summary that sounds natural and informative. Focus on productivity and accomplishments. Mention any concerns like unlinked commits if they exist."""
+        # Tokenizing may have to download the encoding, so keep it off the event loop
+        prompt = await sync_to_async(self._build_summary_prompt, thread_sensitive=False)(
+            report_data
+        )
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that summarizes developer work activity. Be concise, professional, and encouraging."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=200
-            )
+            async with self._client() as client:
+                response = await client.chat.completions.create(
+                    model=MODEL,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": _SUMMARY_SYSTEM_PROMPT
+                        },
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=200
+                )
             
             return response.choices[0].message.content.strip()
         
@@ -67,6 +141,15 @@ Generate a 2-3 sentence summary that sounds natural and informative. Focus on pr
             logger.error(f"Error generating AI summary: {e}")
             return self._generate_fallback_summary(stats, date_range)
     
+    def _build_summary_prompt(self, report_data: Dict[str, Any]) -> str:
+        """Fill the summary prompt template from the report data."""
+        return _SUMMARY_PROMPT_TMPL.format_map({
+            **_SUMMARY_PROMPT_DEFAULTS,
+            **report_data.get('date_range', {}),
+            **report_data.get('stats', {}),
+            'tickets': self._format_tickets(report_data.get('tickets', [])[:5]),
+        })
+    
     def _format_tickets(self, tickets: list) -> str:
         """Format ticket list for prompt."""
         if not tickets:
@@ -74,9 +157,22 @@ Generate a 2-3 sentence summary that sounds natural and informative. Focus on pr
         
         lines = []
         for t in tickets:
-            lines.append(f"- {t.get('key', 'N/A')}: {t.get('title', 'No title')[:50]} ({t.get('commits_count', 0)} commits)")
+            title = self._truncate_title(t.get('title', 'No title'))
+            lines.append(f"- {t.get('key', 'N/A')}: {title} ({t.get('commits_count', 0)} commits)")
         return '\n'.join(lines)
     
+    def _truncate_title(self, title: str) -> str:
+        """Truncate a ticket title to the prompt's token budget."""
+        encoding = _get_encoding()
+        if encoding is None:
+            return title[:50]
+        
+        tokens = encoding.encode(title)
+        if len(tokens) <= _TICKET_TITLE_MAX_TOKENS:
+            return title
+        # A cut inside a multibyte character decodes to U+FFFD; drop it
+        return encoding.decode(tokens[:_TICKET_TITLE_MAX_TOKENS]).rstrip('\ufffd')
+    
     def _generate_fallback_summary(self, stats: Dict, date_range: Dict) -> str:
         """Generate a basic summary without AI."""
         start = date_range.get('start', 'the start')
@@ -115,7 +211,7 @@ Generate a 2-3 sentence summary that sounds natural and informative. Focus on pr
         insights = []
         
         # Fast win: completed quickly with minimal effort
-        if current_status in ['done', 'closed', 'resolved']:
+        if current_status in DONE_STATUSES:
             if commits_count <= 3 and time_logged_hours <= 2:
                 classification = 'fast_win'
                 insights.append("Quick turnaround with minimal effort")
@@ -131,7 +227,7 @@ Generate a 2-3 sentence summary that sounds natural and informative. Focus on pr
         
         # Stalled: has activity but stuck
         elif commits_count > 0 or time_logged_hours > 0:
-            if status_changes == 0 and current_status not in ['done', 'closed', 'resolved']:
+            if status_changes == 0 and current_status not in DONE_STATUSES:
                 classification = 'stalled'
                 insights.append("Work detected but ticket hasn't progressed")
         
@@ -145,7 +241,17 @@ Generate a 2-3 sentence summary that sounds natural and informative. Focus on pr
             }
         }
     
-    def generate_hygiene_recommendations(self, alerts: list) -> str:
+    def generate_effort_analyses(self, tickets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Analyze effort vs output for each ticket in a batch.
+        
+        Calls generate_effort_analysis per ticket and returns the analyses in
+        the same order as the input.
+        """
+        analyze = self.generate_effort_analysis
+        return [analyze(ticket_data) for ticket_data in tickets]
+    
+    async def generate_hygiene_recommendations(self, alerts: list) -> str:
         """Generate actionable recommendations based on hygiene alerts."""
         if not alerts:
             return "Great job! No hygiene issues detected."
@@ -163,18 +269,19 @@ Issues Found:
 Focus on practical steps to improve workflow hygiene. Be constructive and encouraging."""
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful dev productivity coach. Give brief, actionable advice."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=150
-            )
+            async with self._client() as client:
+                response = await client.chat.completions.create(
+                    model=MODEL,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a helpful dev productivity coach. Give brief, actionable advice."
+                        },
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=150
+                )
             
             return response.choices[0].message.content.strip()
         
@@ -3,8 +3,10 @@ Analytics service for effort vs output analysis and hygiene detection.
 """
 
 import logging
+from collections import defaultdict
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from django.db.models import Count, Sum, Q
 from django.utils import timezone
 
@@ -12,10 +14,36 @@ from core.models import (
     User, Commit, Ticket, TicketActivity, 
     Worklog, HygieneAlert
 )
+from core.utils import bump_report_cache_version
 from .ai_service import AIService
 
 logger = logging.getLogger(__name__)
 
+# Maps effort classifications to their bucket in the effort analysis summary
+EFFORT_BUCKETS = {
+    'fast_win': 'fast_wins',
+    'high_effort_low_output': 'high_effort_low_output',
+    'stalled': 'stalled',
+    'normal': 'normal',
+}
+
+
+@lru_cache(maxsize=4096)
+def format_time(seconds: int) -> str:
+    """Format seconds into human-readable string."""
+    if seconds == 0:
+        return '0h'
+    
+    hours = seconds // 3600
+    minutes = (seconds % 3600) // 60
+    
+    if hours > 0 and minutes > 0:
+        return f"{hours}h {minutes}m"
+    elif hours > 0:
+        return f"{hours}h"
+    else:
+        return f"{minutes}m"
+
 
 class AnalyticsService:
     """Service for analyzing work patterns and detecting issues."""
@@ -24,79 +52,102 @@ class AnalyticsService:
         self.user = user
         self.ai_service = AIService()
     
-    def analyze_ticket_effort(
+    def _build_effort_data(
         self,
         ticket: Ticket,
+        commits_count: int,
+        status_changes_count: int,
+        time_logged_seconds: int,
+    ) -> Dict[str, Any]:
+        """Shape a ticket's effort metrics for classification."""
+        return {
+            'key': ticket.key,
+            'title': ticket.title,
+            'status': ticket.status,
+            'commits_count': commits_count,
+            'status_changes_count': status_changes_count,
+            'time_logged_seconds': time_logged_seconds,
+            'time_logged_display': self._format_time(time_logged_seconds),
+        }
+    
+    def build_ticket_facts(
+        self,
         since: datetime,
         until: datetime,
-    ) -> Dict[str, Any]:
-        """Analyze effort vs output for a single ticket."""
-        # Get commits for this ticket
-        commits = Commit.objects.filter(
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Build per-ticket activity facts for the date range.
+        
+        Returns a dict keyed by ticket id covering every ticket with commits,
+        activities or worklogs in the range. Each entry holds the ticket and
+        its commit, status change, comment and worklog counts along with the
+        total logged seconds. Report stats, ticket details, hygiene checks and
+        effort analysis are all derived from it, so each table is scanned once.
+        """
+        facts = defaultdict(lambda: {
+            'ticket': None,
+            'commits': 0,
+            'status_changes': 0,
+            'comments': 0,
+            'worklogs': 0,
+            'worklog_seconds': 0,
+        })
+        
+        # Commits per ticket
+        commit_counts = Commit.objects.filter(
             user=self.user,
-            ticket=ticket,
             committed_at__gte=since,
             committed_at__lte=until,
-        )
+            ticket__isnull=False,
+        ).order_by().values('ticket_id').annotate(count=Count('id'))
+        
+        for row in commit_counts:
+            facts[row['ticket_id']]['commits'] = row['count']
         
-        # Get status changes
-        status_changes = TicketActivity.objects.filter(
+        # Activities per ticket and type
+        activity_counts = TicketActivity.objects.filter(
             user=self.user,
-            ticket=ticket,
-            activity_type='status_change',
             activity_at__gte=since,
             activity_at__lte=until,
-        )
+        ).order_by().values('ticket_id', 'activity_type').annotate(count=Count('id'))
+        
+        for row in activity_counts:
+            fact = facts[row['ticket_id']]
+            if row['activity_type'] == 'status_change':
+                fact['status_changes'] = row['count']
+            elif row['activity_type'] == 'comment':
+                fact['comments'] = row['count']
         
-        # Get worklogs
-        worklogs = Worklog.objects.filter(
+        # Worklogs and logged time per ticket
+        worklog_totals = Worklog.objects.filter(
             user=self.user,
-            ticket=ticket,
             started_at__gte=since,
             started_at__lte=until,
+        ).order_by().values('ticket_id').annotate(
+            count=Count('id'),
+            seconds=Sum('time_spent_seconds'),
         )
         
-        total_time_seconds = worklogs.aggregate(
-            total=Sum('time_spent_seconds')
-        )['total'] or 0
-        
-        ticket_data = {
-            'key': ticket.key,
-            'title': ticket.title,
-            'status': ticket.status,
-            'commits_count': commits.count(),
-            'status_changes_count': status_changes.count(),
-            'time_logged_seconds': total_time_seconds,
-            'time_logged_display': self._format_time(total_time_seconds),
-        }
+        for row in worklog_totals:
+            fact = facts[row['ticket_id']]
+            fact['worklogs'] = row['count']
+            fact['worklog_seconds'] = row['seconds'] or 0
         
-        # Get AI analysis
-        analysis = self.ai_service.generate_effort_analysis(ticket_data)
+        tickets = Ticket.objects.only('id', 'key', 'title', 'status', 'url').in_bulk(list(facts))
+        for ticket_id, ticket in tickets.items():
+            facts[ticket_id]['ticket'] = ticket
         
-        return {
-            **ticket_data,
-            'analysis': analysis,
-        }
+        return dict(facts)
     
     def _format_time(self, seconds: int) -> str:
         """Format seconds into human-readable string."""
-        if seconds == 0:
-            return '0h'
-        
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        
-        if hours > 0 and minutes > 0:
-            return f"{hours}h {minutes}m"
-        elif hours > 0:
-            return f"{hours}h"
-        else:
-            return f"{minutes}m"
+        return format_time(seconds)
     
     def detect_hygiene_issues(
         self,
         since: datetime,
         until: datetime,
+        facts: Optional[Dict[Any, Dict[str, Any]]] = None,
     ) -> List[HygieneAlert]:
         """
         Detect and create hygiene alerts for the date range.
@@ -106,147 +157,111 @@ class AnalyticsService:
         2. Status changes without commits
         3. Time logged without code
         4. Tickets worked on but never moved
+        
+        Pass facts from build_ticket_facts() to reuse them; otherwise they
+        are built here.
         """
+        if facts is None:
+            facts = self.build_ticket_facts(since, until)
+        
+        since_date = since.date()
+        until_date = until.date()
+        
         alerts = []
         
+        # Tickets/commits that already have an alert of each type for this range
+        existing = set()
+        for alert_type, ticket_id, commit_id in HygieneAlert.objects.filter(
+            user=self.user,
+            detected_for_start=since_date,
+            detected_for_end=until_date,
+        ).values_list('alert_type', 'ticket_id', 'commit_id'):
+            existing.add((alert_type, ticket_id))
+            existing.add((alert_type, commit_id))
+        
         # 1. Commits without Jira tickets
         unlinked_commits = Commit.objects.filter(
             user=self.user,
             is_unlinked=True,
             committed_at__gte=since,
             committed_at__lte=until,
-        )
+        ).select_related('repository')
         
         for commit in unlinked_commits:
-            alert, created = HygieneAlert.objects.get_or_create(
-                user=self.user,
-                alert_type='commit_no_ticket',
-                commit=commit,
-                detected_for_start=since.date(),
-                detected_for_end=until.date(),
-                defaults={
-                    'severity': 'warning',
-                    'title': f"Commit without ticket reference",
-                    'description': f"Commit {commit.sha[:7]} in {commit.repository.full_name} has no Jira ticket reference.",
-                    'recommendation': "Add a ticket reference (e.g., PROJ-123) to your commit messages for better tracking.",
-                }
-            )
-            if created:
-                alerts.append(alert)
+            if ('commit_no_ticket', commit.id) not in existing:
+                alerts.append(HygieneAlert(
+                    user=self.user,
+                    alert_type='commit_no_ticket',
+                    commit=commit,
+                    detected_for_start=since_date,
+                    detected_for_end=until_date,
+                    severity='warning',
+                    title=f"Commit without ticket reference",
+                    description=f"Commit {commit.sha[:7]} in {commit.repository.full_name} has no Jira ticket reference.",
+                    recommendation="Add a ticket reference (e.g., PROJ-123) to your commit messages for better tracking.",
+                ))
         
         # 2. Status changes without commits (non-code activity)
-        tickets_with_status_changes = TicketActivity.objects.filter(
-            user=self.user,
-            activity_type='status_change',
-            activity_at__gte=since,
-            activity_at__lte=until,
-        ).values_list('ticket_id', flat=True).distinct()
-        
-        for ticket_id in tickets_with_status_changes:
-            ticket = Ticket.objects.get(id=ticket_id)
-            
-            # Check if there are any commits for this ticket
-            commits_count = Commit.objects.filter(
-                user=self.user,
-                ticket=ticket,
-                committed_at__gte=since,
-                committed_at__lte=until,
-            ).count()
-            
-            if commits_count == 0:
-                alert, created = HygieneAlert.objects.get_or_create(
+        for fact in facts.values():
+            ticket = fact['ticket']
+            if fact['status_changes'] and not fact['commits'] and ('status_no_commit', ticket.id) not in existing:
+                alerts.append(HygieneAlert(
                     user=self.user,
                     alert_type='status_no_commit',
                     ticket=ticket,
-                    detected_for_start=since.date(),
-                    detected_for_end=until.date(),
-                    defaults={
-                        'severity': 'info',
-                        'title': f"Status change without commits",
-                        'description': f"Ticket {ticket.key} had status changes but no associated commits.",
-                        'recommendation': "This may indicate non-code work like design or documentation. Consider logging this as part of your workflow.",
-                    }
-                )
-                if created:
-                    alerts.append(alert)
+                    detected_for_start=since_date,
+                    detected_for_end=until_date,
+                    severity='info',
+                    title=f"Status change without commits",
+                    description=f"Ticket {ticket.key} had status changes but no associated commits.",
+                    recommendation="This may indicate non-code work like design or documentation. Consider logging this as part of your workflow.",
+                ))
         
         # 3. Time logged without code
-        tickets_with_worklogs = Worklog.objects.filter(
-            user=self.user,
-            started_at__gte=since,
-            started_at__lte=until,
-        ).values_list('ticket_id', flat=True).distinct()
-        
-        for ticket_id in tickets_with_worklogs:
-            ticket = Ticket.objects.get(id=ticket_id)
-            
-            commits_count = Commit.objects.filter(
-                user=self.user,
-                ticket=ticket,
-                committed_at__gte=since,
-                committed_at__lte=until,
-            ).count()
-            
-            if commits_count == 0:
-                # Check if we already have an alert
-                existing = HygieneAlert.objects.filter(
+        for fact in facts.values():
+            ticket = fact['ticket']
+            if fact['worklogs'] and not fact['commits'] and ('time_no_code', ticket.id) not in existing:
+                alerts.append(HygieneAlert(
                     user=self.user,
                     alert_type='time_no_code',
                     ticket=ticket,
-                    detected_for_start=since.date(),
-                    detected_for_end=until.date(),
-                ).exists()
-                
-                if not existing:
-                    alert = HygieneAlert.objects.create(
-                        user=self.user,
-                        alert_type='time_no_code',
-                        ticket=ticket,
-                        detected_for_start=since.date(),
-                        detected_for_end=until.date(),
-                        severity='info',
-                        title=f"Time logged without code",
-                        description=f"Time was logged on {ticket.key} but no commits were made.",
-                        recommendation="If this was non-coding work, this is fine. Otherwise, ensure commits reference the ticket.",
-                    )
-                    alerts.append(alert)
+                    detected_for_start=since_date,
+                    detected_for_end=until_date,
+                    severity='info',
+                    title=f"Time logged without code",
+                    description=f"Time was logged on {ticket.key} but no commits were made.",
+                    recommendation="If this was non-coding work, this is fine. Otherwise, ensure commits reference the ticket.",
+                ))
         
         # 4. Tickets worked on but never moved (stalled)
         # Get tickets with commits but no status changes
-        tickets_with_commits = Commit.objects.filter(
-            user=self.user,
-            committed_at__gte=since,
-            committed_at__lte=until,
-            ticket__isnull=False,
-        ).values_list('ticket_id', flat=True).distinct()
-        
-        for ticket_id in tickets_with_commits:
-            ticket = Ticket.objects.get(id=ticket_id)
-            
-            status_changes = TicketActivity.objects.filter(
-                user=self.user,
-                ticket=ticket,
-                activity_type='status_change',
-                activity_at__gte=since,
-                activity_at__lte=until,
-            ).count()
-            
-            if status_changes == 0:
-                alert, created = HygieneAlert.objects.get_or_create(
+        for fact in facts.values():
+            ticket = fact['ticket']
+            if fact['commits'] and not fact['status_changes'] and ('stalled_ticket', ticket.id) not in existing:
+                alerts.append(HygieneAlert(
                     user=self.user,
                     alert_type='stalled_ticket',
                     ticket=ticket,
-                    detected_for_start=since.date(),
-                    detected_for_end=until.date(),
-                    defaults={
-                        'severity': 'warning',
-                        'title': f"Stalled ticket",
-                        'description': f"Ticket {ticket.key} has commits but no status changes.",
-                        'recommendation': "Consider updating the ticket status to reflect your progress.",
-                    }
-                )
-                if created:
-                    alerts.append(alert)
+                    detected_for_start=since_date,
+                    detected_for_end=until_date,
+                    severity='warning',
+                    title=f"Stalled ticket",
+                    description=f"Ticket {ticket.key} has commits but no status changes.",
+                    recommendation="Consider updating the ticket status to reflect your progress.",
+                ))
+        
+        # Alerts raced in by a concurrent run hit the unique constraints and are skipped
+        HygieneAlert.objects.bulk_create(alerts, batch_size=500, ignore_conflicts=True)
+        
+        if alerts:
+            # Skipped alerts keep their unsaved ids, so only return the rows that landed
+            inserted_ids = set(HygieneAlert.objects.filter(
+                id__in=[alert.id for alert in alerts],
+            ).values_list('id', flat=True))
+            alerts = [alert for alert in alerts if alert.id in inserted_ids]
+        
+        if alerts:
+            bump_report_cache_version(self.user)
         
         return alerts
     
@@ -254,38 +269,17 @@ class AnalyticsService:
         self,
         since: datetime,
         until: datetime,
+        facts: Optional[Dict[Any, Dict[str, Any]]] = None,
     ) -> Dict[str, Any]:
-        """Get effort vs output analysis for all tickets in date range."""
-        # Get all tickets with activity
-        ticket_ids = set()
-        
-        # From commits
-        ticket_ids.update(
-            Commit.objects.filter(
-                user=self.user,
-                committed_at__gte=since,
-                committed_at__lte=until,
-                ticket__isnull=False,
-            ).values_list('ticket_id', flat=True)
-        )
-        
-        # From activities
-        ticket_ids.update(
-            TicketActivity.objects.filter(
-                user=self.user,
-                activity_at__gte=since,
-                activity_at__lte=until,
-            ).values_list('ticket_id', flat=True)
-        )
+        """
+        Get effort vs output analysis for all tickets in date range.
         
-        # From worklogs
-        ticket_ids.update(
-            Worklog.objects.filter(
-                user=self.user,
-                started_at__gte=since,
-                started_at__lte=until,
-            ).values_list('ticket_id', flat=True)
-        )
+        Pass facts from build_ticket_facts() to reuse them; otherwise they
+        are built here.
+        """
+        # Get all tickets with activity
+        if facts is None:
+            facts = self.build_ticket_facts(since, until)
         
         analyses = {
             'fast_wins': [],
@@ -294,11 +288,19 @@ class AnalyticsService:
             'normal': [],
         }
         
-        for ticket_id in ticket_ids:
-            ticket = Ticket.objects.get(id=ticket_id)
-            analysis = self.analyze_ticket_effort(ticket, since, until)
-            classification = analysis['analysis']['classification']
-            analyses[classification].append(analysis)
+        tickets_data = [
+            self._build_effort_data(
+                fact['ticket'], fact['commits'], fact['status_changes'], fact['worklog_seconds']
+            )
+            for fact in facts.values()
+        ]
+        
+        # Classify every ticket in a single batch
+        effort_analyses = self.ai_service.generate_effort_analyses(tickets_data)
+        
+        for ticket_data, analysis in zip(tickets_data, effort_analyses):
+            bucket = EFFORT_BUCKETS[analysis['classification']]
+            analyses[bucket].append({**ticket_data, 'analysis': analysis})
         
         return {
             'summary': {
@@ -323,11 +325,22 @@ class AnalyticsService:
             is_resolved=False,
         )
         
-        by_type = alerts.values('alert_type').annotate(count=Count('id'))
+        by_type = {
+            item['alert_type']: item['count']
+            for item in alerts.order_by().values('alert_type').annotate(count=Count('id'))
+        }
+        
+        # Limit to 20 most recent
+        recent_alerts = list(
+            alerts.select_related('ticket', 'commit').only(
+                'id', 'alert_type', 'severity', 'title', 'description',
+                'recommendation', 'ticket__key', 'commit__sha',
+            )[:20]
+        )
         
         return {
-            'total_alerts': alerts.count(),
-            'by_type': {item['alert_type']: item['count'] for item in by_type},
+            'total_alerts': sum(by_type.values()),
+            'by_type': by_type,
             'alerts': [
                 {
                     'id': str(a.id),
@@ -339,6 +352,6 @@ class AnalyticsService:
                     'ticket_key': a.ticket.key if a.ticket else None,
                     'commit_sha': a.commit.sha[:7] if a.commit else None,
                 }
-                for a in alerts[:20]  # Limit to 20 most recent
+                for a in recent_alerts
             ]
         }
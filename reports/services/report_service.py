@@ -2,22 +2,31 @@
 Report generation service.
 """
 
+import asyncio
+import io
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-from django.db.models import Sum, Count, Q
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Exists, OuterRef, Prefetch, prefetch_related_objects
+from django.db.models.functions import Lower
 from django.utils import timezone
 
-from core.models import (
-    User, Commit, Ticket, TicketActivity, 
-    Worklog, WeeklyReport, HygieneAlert
-)
+from core.models import User, Commit, TicketActivity, WeeklyReport
+from core.utils import REPORT_CACHE_TIMEOUT, report_cache_key
 from integrations.services import GitHubService, JiraService
+from reports.utils import DONE_STATUSES
 from .ai_service import AIService
-from .analytics_service import AnalyticsService
+from .analytics_service import AnalyticsService, format_time
 
 logger = logging.getLogger(__name__)
 
+# Seconds a stored weekly report's data stays cached; keys change whenever the row does
+STORED_REPORT_CACHE_TIMEOUT = 7 * 24 * 3600
+
 
 class ReportService:
     """Service for generating work reports."""
@@ -40,29 +49,60 @@ class ReportService:
             'jira': {'tickets': [], 'activities': [], 'worklogs': []},
         }
         
-        # Sync GitHub data
-        if self.user.github_connected:
-            try:
-                github_service = GitHubService(self.user)
-                commit_results = github_service.sync_all_tracked_repos(since, until)
-                results['github']['commits'] = sum(len(c) for c in commit_results.values())
-                results['github']['repos'] = list(commit_results.keys())
-            except Exception as e:
-                logger.error(f"Error syncing GitHub data: {e}")
-        
-        # Sync Jira data
-        if self.user.jira_connected:
-            try:
-                jira_service = JiraService(self.user)
-                jira_results = jira_service.sync_all_for_date_range(since, until)
-                results['jira']['tickets'] = len(jira_results['tickets'])
-                results['jira']['activities'] = len(jira_results['activities'])
-                results['jira']['worklogs'] = len(jira_results['worklogs'])
-            except Exception as e:
-                logger.error(f"Error syncing Jira data: {e}")
+        # GitHub and Jira are independent and I/O bound, so sync them side by side.
+        # SQLite allows a single writer, so there they take turns on one worker
+        # instead of failing with "database is locked".
+        max_workers = 1 if connection.vendor == 'sqlite' else 2
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            github_future = (
+                executor.submit(self._sync_github, since, until)
+                if self.user.github_connected else None
+            )
+            jira_future = (
+                executor.submit(self._sync_jira, since, until)
+                if self.user.jira_connected else None
+            )
+            
+            if github_future:
+                try:
+                    results['github'] = github_future.result()
+                except Exception as e:
+                    logger.error(f"Error syncing GitHub data: {e}")
+            
+            if jira_future:
+                try:
+                    results['jira'] = jira_future.result()
+                except Exception as e:
+                    logger.error(f"Error syncing Jira data: {e}")
         
         return results
     
+    def _sync_github(self, since: datetime, until: datetime) -> Dict[str, Any]:
+        """Sync GitHub commits for the date range on a worker thread."""
+        try:
+            github_service = GitHubService(self.user)
+            commit_results = github_service.sync_all_tracked_repos(since, until)
+            return {
+                'commits': sum(len(c) for c in commit_results.values()),
+                'repos': list(commit_results.keys()),
+            }
+        finally:
+            # Worker threads get their own connection; don't leak it
+            connection.close()
+    
+    def _sync_jira(self, since: datetime, until: datetime) -> Dict[str, Any]:
+        """Sync Jira tickets, activities and worklogs on a worker thread."""
+        try:
+            jira_service = JiraService(self.user)
+            jira_results = jira_service.sync_all_for_date_range(since, until)
+            return {
+                'tickets': len(jira_results['tickets']),
+                'activities': len(jira_results['activities']),
+                'worklogs': len(jira_results['worklogs']),
+            }
+        finally:
+            connection.close()
+    
     def generate_report(
         self,
         since: datetime,
@@ -71,26 +111,28 @@ class ReportService:
     ) -> Dict[str, Any]:
         """
         Generate a comprehensive work report for the date range.
+        
+        Reports are cached per user and range until the user's data changes.
         """
-        # Optionally sync data first
+        # Optionally sync data first; a sync that writes data moves the cache key on
         if sync_first:
             self.sync_data_for_range(since, until)
         
-        # Gather statistics
-        stats = self._calculate_stats(since, until)
+        cached = cache.get(self._report_cache_key(since, until))
+        if cached is not None:
+            return cached
         
-        # Get ticket details
-        tickets_data = self._get_tickets_data(since, until)
+        # Per-ticket facts shared by the stats, ticket details and analytics
+        facts = self.analytics_service.build_ticket_facts(since, until)
         
         # Get unlinked commits
         unlinked_commits = self._get_unlinked_commits(since, until)
         
-        # Detect hygiene issues
-        self.analytics_service.detect_hygiene_issues(since, until)
-        hygiene_summary = self.analytics_service.get_hygiene_summary(since, until)
+        # Gather statistics
+        stats = self._calculate_stats(since, until, facts, len(unlinked_commits))
         
-        # Get effort analysis
-        effort_analysis = self.analytics_service.get_effort_analysis_summary(since, until)
+        # Get ticket details
+        tickets_data = self._get_tickets_data(since, until, facts)
         
         # Build report data
         report_data = {
@@ -101,22 +143,66 @@ class ReportService:
             'stats': stats,
             'tickets': tickets_data,
             'unlinked_commits': unlinked_commits,
-            'hygiene': hygiene_summary,
-            'effort_analysis': effort_analysis,
         }
         
-        # Generate AI summary
-        report_data['summary'] = self.ai_service.generate_work_summary(report_data)
+        # Generate AI summary while hygiene/effort analytics run
+        summary, (hygiene_summary, effort_analysis) = async_to_sync(
+            self._summarize_with_analytics
+        )(report_data, since, until, facts)
+        
+        report_data['hygiene'] = hygiene_summary
+        report_data['effort_analysis'] = effort_analysis
+        report_data['summary'] = summary
         
         # Generate markdown report
         report_data['markdown'] = self._generate_markdown_report(report_data)
         
+        # Detection may have bumped the version, so key on the current one
+        cache.set(self._report_cache_key(since, until), report_data, REPORT_CACHE_TIMEOUT)
+        
         return report_data
     
+    def _report_cache_key(self, since: datetime, until: datetime) -> str:
+        """Cache key for a report, scoped to the user's current data version."""
+        return report_cache_key(self.user, 'report', since, until)
+    
+    async def _summarize_with_analytics(
+        self,
+        report_data: Dict[str, Any],
+        since: datetime,
+        until: datetime,
+        facts: Dict[Any, Dict[str, Any]],
+    ) -> Tuple[str, Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Await the AI summary and the analytics queries concurrently.
+        
+        The summary prompt only reads stats and tickets, so the hygiene and
+        effort analytics don't need to wait for the OpenAI round trip.
+        """
+        summary, analytics = await asyncio.gather(
+            self.ai_service.generate_work_summary(report_data),
+            sync_to_async(self._run_analytics)(since, until, facts),
+        )
+        return summary, analytics
+    
+    def _run_analytics(
+        self,
+        since: datetime,
+        until: datetime,
+        facts: Dict[Any, Dict[str, Any]],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Detect hygiene issues and compute the hygiene/effort summaries."""
+        self.analytics_service.detect_hygiene_issues(since, until, facts)
+        hygiene_summary = self.analytics_service.get_hygiene_summary(since, until)
+        effort_analysis = self.analytics_service.get_effort_analysis_summary(since, until, facts)
+        return hygiene_summary, effort_analysis
+    
     def _calculate_stats(
         self,
         since: datetime,
         until: datetime,
+        facts: Dict[Any, Dict[str, Any]],
+        unlinked_commits: int,
     ) -> Dict[str, Any]:
         """Calculate aggregate statistics for the date range."""
         # Total commits
@@ -126,43 +212,8 @@ class ReportService:
             committed_at__lte=until,
         ).count()
         
-        # Unlinked commits
-        unlinked_commits = Commit.objects.filter(
-            user=self.user,
-            committed_at__gte=since,
-            committed_at__lte=until,
-            is_unlinked=True,
-        ).count()
-        
-        # Tickets worked on (from commits or activities)
-        ticket_ids = set()
-        
-        # From commits
-        commit_ticket_ids = Commit.objects.filter(
-            user=self.user,
-            committed_at__gte=since,
-            committed_at__lte=until,
-            ticket__isnull=False,
-        ).values_list('ticket_id', flat=True)
-        ticket_ids.update(commit_ticket_ids)
-        
-        # From activities
-        activity_ticket_ids = TicketActivity.objects.filter(
-            user=self.user,
-            activity_at__gte=since,
-            activity_at__lte=until,
-        ).values_list('ticket_id', flat=True)
-        ticket_ids.update(activity_ticket_ids)
-        
-        # From worklogs
-        worklog_ticket_ids = Worklog.objects.filter(
-            user=self.user,
-            started_at__gte=since,
-            started_at__lte=until,
-        ).values_list('ticket_id', flat=True)
-        ticket_ids.update(worklog_ticket_ids)
-        
-        total_tickets = len(ticket_ids)
+        # Tickets worked on (from commits, activities or worklogs)
+        total_tickets = len(facts)
         
         # Tickets completed (moved to Done/Closed)
         tickets_completed = TicketActivity.objects.filter(
@@ -170,25 +221,27 @@ class ReportService:
             activity_type='status_change',
             activity_at__gte=since,
             activity_at__lte=until,
-            to_status__iregex=r'(done|closed|resolved|complete)',
+        ).annotate(
+            to_status_lower=Lower('to_status'),
+        ).filter(
+            to_status_lower__in=DONE_STATUSES,
         ).values('ticket_id').distinct().count()
         
         # Total time logged
-        total_time = Worklog.objects.filter(
-            user=self.user,
-            started_at__gte=since,
-            started_at__lte=until,
-        ).aggregate(total=Sum('time_spent_seconds'))['total'] or 0
+        total_time = sum(fact['worklog_seconds'] for fact in facts.values())
         
         # Non-code activities (status changes without commits)
         non_code_activities = TicketActivity.objects.filter(
+            ~Exists(Commit.objects.filter(
+                user=self.user,
+                ticket_id=OuterRef('ticket_id'),
+                committed_at__gte=since,
+                committed_at__lte=until,
+            )),
             user=self.user,
             activity_type='status_change',
             activity_at__gte=since,
             activity_at__lte=until,
-        ).exclude(
-            ticket__commits__committed_at__gte=since,
-            ticket__commits__committed_at__lte=until,
         ).count()
         
         return {
@@ -203,102 +256,52 @@ class ReportService:
     
     def _format_time(self, seconds: int) -> str:
         """Format seconds into human-readable string."""
-        if seconds == 0:
-            return '0h'
-        
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        
-        if hours > 0 and minutes > 0:
-            return f"{hours}h {minutes}m"
-        elif hours > 0:
-            return f"{hours}h"
-        else:
-            return f"{minutes}m"
+        return format_time(seconds)
     
     def _get_tickets_data(
         self,
         since: datetime,
         until: datetime,
+        facts: Dict[Any, Dict[str, Any]],
     ) -> List[Dict[str, Any]]:
         """Get detailed data for each ticket worked on."""
-        # Get all ticket IDs with activity
-        ticket_ids = set()
-        
-        # From commits
-        ticket_ids.update(
-            Commit.objects.filter(
-                user=self.user,
-                committed_at__gte=since,
-                committed_at__lte=until,
-                ticket__isnull=False,
-            ).values_list('ticket_id', flat=True)
-        )
-        
-        # From activities
-        ticket_ids.update(
-            TicketActivity.objects.filter(
-                user=self.user,
-                activity_at__gte=since,
-                activity_at__lte=until,
-            ).values_list('ticket_id', flat=True)
-        )
+        tickets_data = []
         
-        # From worklogs
-        ticket_ids.update(
-            Worklog.objects.filter(
-                user=self.user,
-                started_at__gte=since,
-                started_at__lte=until,
-            ).values_list('ticket_id', flat=True)
+        # Load the commits and status changes in range for every ticket at once
+        prefetch_related_objects(
+            [fact['ticket'] for fact in facts.values()],
+            Prefetch(
+                'commits',
+                queryset=Commit.objects.filter(
+                    user=self.user,
+                    committed_at__gte=since,
+                    committed_at__lte=until,
+                ).only('id', 'ticket_id', 'sha', 'message', 'committed_at'),
+                to_attr='period_commits',
+            ),
+            Prefetch(
+                'activities',
+                queryset=TicketActivity.objects.filter(
+                    user=self.user,
+                    activity_type='status_change',
+                    activity_at__gte=since,
+                    activity_at__lte=until,
+                ).only('id', 'ticket_id', 'from_status', 'to_status', 'activity_at'),
+                to_attr='period_status_changes',
+            ),
         )
         
-        tickets_data = []
-        
-        for ticket_id in ticket_ids:
-            ticket = Ticket.objects.get(id=ticket_id)
-            
-            # Get commits for this ticket
-            commits = Commit.objects.filter(
-                user=self.user,
-                ticket=ticket,
-                committed_at__gte=since,
-                committed_at__lte=until,
-            )
-            
-            # Get status changes
-            status_changes = TicketActivity.objects.filter(
-                user=self.user,
-                ticket=ticket,
-                activity_type='status_change',
-                activity_at__gte=since,
-                activity_at__lte=until,
-            )
-            
-            # Get comments
-            comments = TicketActivity.objects.filter(
-                user=self.user,
-                ticket=ticket,
-                activity_type='comment',
-                activity_at__gte=since,
-                activity_at__lte=until,
-            )
-            
-            # Get worklogs
-            worklogs = Worklog.objects.filter(
-                user=self.user,
-                ticket=ticket,
-                started_at__gte=since,
-                started_at__lte=until,
-            )
+        for fact in facts.values():
+            ticket = fact['ticket']
+            commits = ticket.period_commits
+            status_changes = ticket.period_status_changes
             
-            total_time = worklogs.aggregate(
-                total=Sum('time_spent_seconds')
-            )['total'] or 0
+            commits_count = fact['commits']
+            total_time = fact['worklog_seconds']
             
             # Determine tags
             tags = []
-            if commits.count() == 0 and (status_changes.count() > 0 or worklogs.count() > 0):
+            if commits_count == 0 and (fact['status_changes'] > 0 or fact['worklogs'] > 0):
                 tags.append('non-code-activity')
             
             tickets_data.append({
@@ -307,7 +310,7 @@ class ReportService:
                 'title': ticket.title,
                 'status': ticket.status,
                 'url': ticket.url,
-                'commits_count': commits.count(),
+                'commits_count': commits_count,
                 'commits': [
                     {
                         'sha': c.sha[:7],
@@ -324,7 +327,7 @@ class ReportService:
                     }
                     for sc in status_changes
                 ],
-                'comments_count': comments.count(),
+                'comments_count': fact['comments'],
                 'time_logged_seconds': total_time,
                 'time_logged_display': self._format_time(total_time),
                 'tags': tags,
@@ -362,77 +365,83 @@ class ReportService:
     
     def _generate_markdown_report(self, report_data: Dict[str, Any]) -> str:
         """Generate a markdown formatted report."""
-        lines = []
+        buf = io.StringIO()
+        write = buf.write
         
         date_range = report_data['date_range']
         stats = report_data['stats']
         
-        lines.append(f"# Work Report: {date_range['start']} to {date_range['end']}")
-        lines.append("")
+        write(f"# Work Report: {date_range['start']} to {date_range['end']}\n")
+        write("\n")
         
         # Summary
-        lines.append("## Summary")
-        lines.append(report_data.get('summary', 'No summary available.'))
-        lines.append("")
+        write("## Summary\n")
+        write(f"{report_data.get('summary', 'No summary available.')}\n")
+        write("\n")
         
         # Statistics
-        lines.append("## Statistics")
-        lines.append(f"- **Tickets Worked On:** {stats['total_tickets']}")
-        lines.append(f"- **Commits Made:** {stats['total_commits']}")
-        lines.append(f"- **Tickets Completed:** {stats['tickets_completed']}")
-        lines.append(f"- **Time Logged:** {stats['total_time_logged_display']}")
-        lines.append(f"- **Unlinked Commits:** {stats['unlinked_commits']}")
-        lines.append(f"- **Non-Code Activities:** {stats['non_code_activities']}")
-        lines.append("")
+        write("## Statistics\n")
+        write(f"- **Tickets Worked On:** {stats['total_tickets']}\n")
+        write(f"- **Commits Made:** {stats['total_commits']}\n")
+        write(f"- **Tickets Completed:** {stats['tickets_completed']}\n")
+        write(f"- **Time Logged:** {stats['total_time_logged_display']}\n")
+        write(f"- **Unlinked Commits:** {stats['unlinked_commits']}\n")
+        write(f"- **Non-Code Activities:** {stats['non_code_activities']}\n")
+        write("\n")
         
         # Tickets
         if report_data['tickets']:
-            lines.append("## Tickets")
+            write("## Tickets\n")
             for ticket in report_data['tickets'][:10]:
                 tags_str = ' '.join([f"`{t}`" for t in ticket.get('tags', [])])
-                lines.append(f"### [{ticket['key']}]({ticket['url']}): {ticket['title']}")
-                lines.append(f"**Status:** {ticket['status']} | **Commits:** {ticket['commits_count']} | **Time:** {ticket['time_logged_display']} {tags_str}")
+                write(f"### [{ticket['key']}]({ticket['url']}): {ticket['title']}\n")
+                write(f"**Status:** {ticket['status']} | **Commits:** {ticket['commits_count']} | **Time:** {ticket['time_logged_display']} {tags_str}\n")
                 
-                if ticket['status_changes']:
-                    for sc in ticket['status_changes']:
-                        lines.append(f"  - Status: {sc['from']} → {sc['to']}")
+                buf.writelines(
+                    f"  - Status: {sc['from']} → {sc['to']}\n"
+                    for sc in ticket['status_changes']
+                )
                 
-                lines.append("")
+                write("\n")
         
         # Unlinked Commits
         if report_data['unlinked_commits']:
-            lines.append("## Unlinked Work")
-            lines.append("*Commits without Jira ticket references:*")
-            lines.append("")
-            for commit in report_data['unlinked_commits'][:10]:
-                lines.append(f"- `{commit['sha']}` {commit['message']} ({commit['repository']})")
-            lines.append("")
+            write("## Unlinked Work\n")
+            write("*Commits without Jira ticket references:*\n")
+            write("\n")
+            buf.writelines(
+                f"- `{commit['sha']}` {commit['message']} ({commit['repository']})\n"
+                for commit in report_data['unlinked_commits'][:10]
+            )
+            write("\n")
         
         # Hygiene Alerts
         if report_data['hygiene']['total_alerts'] > 0:
-            lines.append("## Hygiene Alerts")
-            lines.append(f"*{report_data['hygiene']['total_alerts']} issues detected*")
-            lines.append("")
-            for alert in report_data['hygiene']['alerts'][:5]:
-                lines.append(f"- **{alert['title']}**: {alert['description']}")
-            lines.append("")
+            write("## Hygiene Alerts\n")
+            write(f"*{report_data['hygiene']['total_alerts']} issues detected*\n")
+            write("\n")
+            buf.writelines(
+                f"- **{alert['title']}**: {alert['description']}\n"
+                for alert in report_data['hygiene']['alerts'][:5]
+            )
+            write("\n")
         
         # Effort Analysis
         effort = report_data['effort_analysis']
         if effort['summary']['fast_wins_count'] > 0 or effort['summary']['high_effort_low_output_count'] > 0:
-            lines.append("## Effort Analysis")
+            write("## Effort Analysis\n")
             if effort['summary']['fast_wins_count'] > 0:
-                lines.append(f"✅ **Fast Wins:** {effort['summary']['fast_wins_count']} tickets")
+                write(f"✅ **Fast Wins:** {effort['summary']['fast_wins_count']} tickets\n")
             if effort['summary']['high_effort_low_output_count'] > 0:
-                lines.append(f"⚠️ **High Effort, Low Output:** {effort['summary']['high_effort_low_output_count']} tickets")
+                write(f"⚠️ **High Effort, Low Output:** {effort['summary']['high_effort_low_output_count']} tickets\n")
             if effort['summary']['stalled_count'] > 0:
-                lines.append(f"🔄 **Stalled:** {effort['summary']['stalled_count']} tickets")
-            lines.append("")
+                write(f"🔄 **Stalled:** {effort['summary']['stalled_count']} tickets\n")
+            write("\n")
         
-        lines.append("---")
-        lines.append(f"*Generated on {timezone.now().strftime('%Y-%m-%d %H:%M UTC')}*")
+        write("---\n")
+        write(f"*Generated on {timezone.now().strftime('%Y-%m-%d %H:%M UTC')}*")
         
-        return '\n'.join(lines)
+        return buf.getvalue()
     
     def create_weekly_report(
         self,
@@ -443,26 +452,100 @@ class ReportService:
         # Generate report data
         report_data = self.generate_report(start_date, end_date, sync_first=True)
         
-        # Create or update weekly report record
-        weekly_report, created = WeeklyReport.objects.update_or_create(
+        return self.store_weekly_report(start_date, end_date, report_data, synced=True)
+    
+    def store_weekly_report(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        report_data: Dict[str, Any],
+        synced: bool = False,
+    ) -> WeeklyReport:
+        """
+        Store already generated report data as the weekly report.
+        
+        A synced report replaces whatever is stored for the week; an unsynced
+        one is only stored when the week has no report yet.
+        """
+        weekly_report = WeeklyReport(
             user=self.user,
             start_date=start_date.date(),
             end_date=end_date.date(),
-            defaults={
-                'total_tickets': report_data['stats']['total_tickets'],
-                'total_commits': report_data['stats']['total_commits'],
-                'tickets_completed': report_data['stats']['tickets_completed'],
-                'total_time_logged_seconds': report_data['stats']['total_time_logged_seconds'],
-                'unlinked_commits': report_data['stats']['unlinked_commits'],
-                'non_code_activities': report_data['stats']['non_code_activities'],
-                'summary_text': report_data['summary'],
-                'markdown_report': report_data['markdown'],
-                'report_data': report_data,
-            }
+            total_tickets=report_data['stats']['total_tickets'],
+            total_commits=report_data['stats']['total_commits'],
+            tickets_completed=report_data['stats']['tickets_completed'],
+            total_time_logged_seconds=report_data['stats']['total_time_logged_seconds'],
+            unlinked_commits=report_data['stats']['unlinked_commits'],
+            non_code_activities=report_data['stats']['non_code_activities'],
+            summary_text=report_data['summary'],
+            markdown_report=report_data['markdown'],
+            report_data=report_data,
+            is_synced=synced,
+        )
+        if synced:
+            # Create or update weekly report record in a single upsert
+            WeeklyReport.objects.bulk_create(
+                [weekly_report],
+                update_conflicts=True,
+                unique_fields=['user', 'start_date', 'end_date'],
+                update_fields=[
+                    'total_tickets', 'total_commits', 'tickets_completed',
+                    'total_time_logged_seconds', 'unlinked_commits', 'non_code_activities',
+                    'summary_text', 'markdown_report', 'report_data', 'is_synced', 'updated_at',
+                ],
+            )
+        else:
+            WeeklyReport.objects.bulk_create([weekly_report], ignore_conflicts=True)
+        
+        # Re-read so id and created_at reflect an existing row that was updated
+        stored = WeeklyReport.objects.get(
+            user=self.user,
+            start_date=weekly_report.start_date,
+            end_date=weekly_report.end_date,
         )
         
-        return weekly_report
+        cache.set(
+            self._stored_report_cache_key(stored.id, stored.updated_at),
+            stored.report_data,
+            STORED_REPORT_CACHE_TIMEOUT,
+        )
+        
+        return stored
+    
+    def get_stored_report_data(self, start_date: date, end_date: date) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored weekly report's data, from the cache when possible.
+        
+        The row's id and updated_at are always read from the database, so a
+        regenerated or deleted report is never served from a stale entry.
+        """
+        row = WeeklyReport.objects.filter(
+            user=self.user,
+            start_date=start_date,
+            end_date=end_date,
+        ).values_list('id', 'updated_at').first()
+        
+        if row is None:
+            return None
+        
+        cache_key = self._stored_report_cache_key(*row)
+        report_data = cache.get(cache_key)
+        if report_data is not None:
+            return report_data
+        
+        report_data = WeeklyReport.objects.filter(id=row[0]).values_list(
+            'report_data', flat=True
+        ).first()
+        
+        if report_data is not None:
+            cache.set(cache_key, report_data, STORED_REPORT_CACHE_TIMEOUT)
+        return report_data
+    
+    def _stored_report_cache_key(self, report_id, updated_at: datetime) -> str:
+        return f"weekly-report:{report_id}:{updated_at.isoformat()}"
     
     def get_last_week_report(self) -> Optional[WeeklyReport]:
-        """Get the most recent weekly report."""
-        return WeeklyReport.objects.filter(user=self.user).first()
+        """Get the most recent weekly report, without its full data snapshot."""
+        return WeeklyReport.objects.filter(user=self.user).order_by('-end_date').only(
+            'id', 'user_id', 'start_date', 'end_date', 'summary_text', 'markdown_report',
+        ).first()
@@ -3,42 +3,83 @@ Celery tasks for report generation.
 """
 
 import logging
-from datetime import datetime, timedelta
-from celery import shared_task
+from datetime import timedelta
+from itertools import islice
+from celery import group, shared_task
+from django.core.cache import cache
+from django.db import OperationalError
+from django.db.models import Q
 from django.utils import timezone
 
+from reports.utils import week_bounds
+
 logger = logging.getLogger(__name__)
 
+# Seconds a weekly report run may hold its per-user lock
+WEEKLY_REPORT_LOCK_TIMEOUT = 30 * 60
 
-@shared_task
-def generate_weekly_report_for_user(user_id: str):
-    """Generate weekly report for a specific user."""
-    from core.models import User
+# Users fetched and dispatched per group by generate_all_weekly_reports
+USER_DISPATCH_CHUNK_SIZE = 2000
+
+
+# Sync and AI failures are logged and the report is built from what is stored,
+# so only database errors reach the task and are worth retrying.
+@shared_task(
+    bind=True,
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=5,
+)
+def generate_weekly_report_for_user(self, user_id: str):
+    """
+    Generate weekly report for a specific user.
+    
+    Weeks that already have a synced report are skipped. Concurrent runs for
+    the same user and week are serialized with a cache lock, which only spans
+    processes when the cache is shared (REDIS_URL set, as Celery needs anyway).
+    """
+    from core.models import User, WeeklyReport
     from reports.services import ReportService
     
+    # Last week's date range
+    since, until = week_bounds(timezone.now().date(), offset_weeks=-1)
+    
+    # Skip weeks this task already finished (redelivered or duplicated messages)
+    report_id = WeeklyReport.objects.filter(
+        user_id=user_id,
+        start_date=since.date(),
+        end_date=until.date(),
+        is_synced=True,
+    ).values_list('id', flat=True).first()
+    if report_id:
+        logger.info("Weekly report for user %s already generated: %s", user_id, report_id)
+        return str(report_id)
+    
+    # Only one run per user and week at a time
+    lock_key = f"weekly_report_task:{user_id}:{since.date().isoformat()}:lock"
+    if not cache.add(lock_key, self.request.id or True, WEEKLY_REPORT_LOCK_TIMEOUT):
+        logger.info("Weekly report for user %s is already being generated", user_id)
+        return None
+    
     try:
         user = User.objects.get(id=user_id)
         
-        # Calculate last week's date range
-        today = timezone.now().date()
-        start_of_last_week = today - timedelta(days=today.weekday() + 7)
-        end_of_last_week = start_of_last_week + timedelta(days=6)
-        
-        since = timezone.make_aware(datetime.combine(start_of_last_week, datetime.min.time()))
-        until = timezone.make_aware(datetime.combine(end_of_last_week, datetime.max.time()))
-        
         service = ReportService(user)
         report = service.create_weekly_report(since, until)
         
-        logger.info(f"Generated weekly report for {user.email}: {report.id}")
+        logger.info("Generated weekly report for %s: %s", user.email, report.id)
         return str(report.id)
     
     except User.DoesNotExist:
-        logger.error(f"User {user_id} not found")
+        logger.error("User %s not found", user_id)
         return None
-    except Exception as e:
-        logger.exception(f"Error generating weekly report for user {user_id}: {e}")
+    except Exception:
+        logger.exception("Error generating weekly report for user %s", user_id)
         raise
+    finally:
+        cache.delete(lock_key)
 
 
 @shared_task
@@ -47,24 +88,22 @@ def generate_all_weekly_reports():
     from core.models import User
     
     # Get users with at least one integration connected
-    active_users = User.objects.filter(
-        is_active=True
-    ).filter(
-        github_connected=True
-    ) | User.objects.filter(
-        is_active=True
-    ).filter(
-        jira_connected=True
-    )
-    
-    active_users = active_users.distinct()
+    user_ids = User.objects.filter(
+        Q(github_connected=True) | Q(jira_connected=True),
+        is_active=True,
+    ).values_list('id', flat=True)
     
-    logger.info(f"Generating weekly reports for {active_users.count()} users")
+    # Stream ids from a server-side cursor and publish one group per chunk,
+    # so only a chunk's signatures are held in memory at a time
+    ids = user_ids.iterator(chunk_size=USER_DISPATCH_CHUNK_SIZE)
+    queued = 0
+    while chunk := list(islice(ids, USER_DISPATCH_CHUNK_SIZE)):
+        group(generate_weekly_report_for_user.s(str(user_id)) for user_id in chunk).apply_async()
+        queued += len(chunk)
     
-    for user in active_users:
-        generate_weekly_report_for_user.delay(str(user.id))
+    logger.info("Queued weekly reports for %s users", queued)
     
-    return f"Queued reports for {active_users.count()} users"
+    return f"Queued reports for {queued} users"
 
 
 @shared_task
@@ -82,12 +121,12 @@ def sync_user_data(user_id: str, days: int = 7):
         service = ReportService(user)
         results = service.sync_data_for_range(since, until)
         
-        logger.info(f"Synced data for {user.email}: {results}")
+        logger.info("Synced data for %s: %s", user.email, results)
         return results
     
     except User.DoesNotExist:
-        logger.error(f"User {user_id} not found")
+        logger.error("User %s not found", user_id)
         return None
-    except Exception as e:
-        logger.exception(f"Error syncing data for user {user_id}: {e}")
+    except Exception:
+        logger.exception("Error syncing data for user %s", user_id)
         raise
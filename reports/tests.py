@@ -1,3 +1,477 @@
-from django.test import TestCase
+import copy
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from unittest.mock import AsyncMock, patch
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authentication.encryption import encrypt_token
+from core.models import (
+    User, OAuthToken, Repository, Commit, Ticket, TicketActivity, HygieneAlert, WeeklyReport,
+)
+from core.utils import bump_report_cache_version
+from reports.services import ReportService, AnalyticsService
+from reports.services.ai_service import AIService
+from reports.tasks import generate_all_weekly_reports, generate_weekly_report_for_user
+from reports.utils import parse_iso_datetime, week_bounds
+
+
+@patch.object(AIService, 'generate_work_summary', AsyncMock(return_value='Summary'))
+class GenerateReportCacheTests(TestCase):
+    """generate_report caching around the optional sync."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email='dev@local.dev', username='dev')
+        self.since, self.until = week_bounds(date(2026, 10, 14))
+        self.service = ReportService(self.user)
+
+    def test_repeat_report_is_served_from_cache(self):
+        analytics = self.service.analytics_service
+        with patch.object(
+            analytics, 'build_ticket_facts', wraps=analytics.build_ticket_facts
+        ) as build_facts:
+            first = self.service.generate_report(self.since, self.until, sync_first=False)
+            second = self.service.generate_report(self.since, self.until, sync_first=False)
+
+        self.assertEqual(build_facts.call_count, 1)
+        self.assertEqual(first, second)
+
+
+class FakeResponse:
+    """Stand-in for a requests.Response carrying JSON data."""
+
+    status_code = 200
+    content = b'{}'
+
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+def _github_commit(sha, message):
+    return {
+        'sha': sha,
+        'html_url': f'https://github.com/org/repo/commit/{sha}',
+        'commit': {
+            'message': message,
+            'author': {'name': 'dev', 'email': 'dev@local.dev', 'date': '2026-10-14T12:00:00Z'},
+        },
+    }
+
+
+@patch.object(AIService, 'generate_work_summary', AsyncMock(return_value='Summary'))
+class SyncFirstReportCacheTests(TransactionTestCase):
+    """generate_report(sync_first=True) against a stubbed GitHub API."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(
+            email='dev@local.dev', username='dev', github_connected=True
+        )
+        OAuthToken.objects.create(
+            user=self.user, provider='github', access_token_encrypted=encrypt_token('token')
+        )
+        Repository.objects.create(
+            user=self.user, github_id=1, name='repo', full_name='org/repo',
+            url='https://github.com/org/repo', is_tracked=True,
+        )
+        self.since, self.until = week_bounds(date(2026, 10, 14))
+        self.service = ReportService(self.user)
+        self.commits = [_github_commit('a' * 40, 'quick fix')]
+
+    def _fake_request(self, method, url, headers=None, params=None, **kwargs):
+        if url.endswith('/user'):
+            return FakeResponse({'email': 'dev@local.dev'})
+        return FakeResponse(list(self.commits))
+
+    def _generate_twice(self):
+        analytics = self.service.analytics_service
+        with patch(
+            'integrations.services.github_service.requests.request',
+            side_effect=self._fake_request,
+        ) as http, patch.object(
+            analytics, 'build_ticket_facts', wraps=analytics.build_ticket_facts
+        ) as build_facts:
+            self.service.generate_report(self.since, self.until, sync_first=True)
+            self.service.generate_report(self.since, self.until, sync_first=True)
+        return http, build_facts
+
+    def test_no_op_sync_still_hits_cache(self):
+        http, build_facts = self._generate_twice()
+
+        # Both calls synced (user info + commits each), only the first built the report
+        self.assertEqual(http.call_count, 4)
+        self.assertEqual(build_facts.call_count, 1)
+        self.assertEqual(Commit.objects.filter(user=self.user).count(), 1)
+
+    def test_sync_with_new_commits_rebuilds_report(self):
+        self._generate_twice()
+        self.commits.append(_github_commit('b' * 40, 'another fix'))
+
+        _, build_facts = self._generate_twice()
+
+        self.assertEqual(build_facts.call_count, 1)
+        self.assertEqual(Commit.objects.filter(user=self.user).count(), 2)
+
+
+class DetectHygieneIssuesTests(TestCase):
+    """Alerts returned by detect_hygiene_issues."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='dev@local.dev', username='dev')
+        self.since, self.until = week_bounds(date(2026, 10, 14))
+        repository = Repository.objects.create(
+            user=self.user, github_id=1, name='repo', full_name='org/repo',
+            url='https://github.com/org/repo',
+        )
+        Commit.objects.create(
+            user=self.user, repository=repository, sha='a' * 40, message='quick fix',
+            author_name='dev', author_email='dev@local.dev',
+            url='https://github.com/org/repo/commit/a',
+            committed_at=datetime(2026, 10, 14, 12, 0, tzinfo=dt_timezone.utc), is_unlinked=True,
+        )
+        self.service = AnalyticsService(self.user)
+
+    def test_alerts_skipped_as_conflicts_are_not_returned(self):
+        real_bulk_create = HygieneAlert.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            # A concurrent run inserts the same alert first
+            rival = copy.copy(objs[0])
+            rival.id = uuid.uuid4()
+            rival.save(force_insert=True)
+            return real_bulk_create(objs, **kwargs)
+
+        with patch.object(HygieneAlert.objects, 'bulk_create', side_effect=racing_bulk_create):
+            alerts = self.service.detect_hygiene_issues(self.since, self.until)
+
+        self.assertEqual(alerts, [])
+        self.assertEqual(HygieneAlert.objects.filter(user=self.user).count(), 1)
+
+    def test_new_alerts_are_returned(self):
+        alerts = self.service.detect_hygiene_issues(self.since, self.until)
+
+        self.assertEqual(len(alerts), 1)
+        self.assertTrue(HygieneAlert.objects.filter(id=alerts[0].id).exists())
+        self.assertEqual(self.service.detect_hygiene_issues(self.since, self.until), [])
+
+
+class EffortAnalysisSummaryTests(TestCase):
+    """Effort classifications land in their summary buckets."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='dev@local.dev', username='dev')
+        self.since, self.until = week_bounds(date(2026, 10, 14))
+        self.repository = Repository.objects.create(
+            user=self.user, github_id=1, name='repo', full_name='org/repo',
+            url='https://github.com/org/repo',
+        )
+        self.service = AnalyticsService(self.user)
+
+    def _ticket_with_commit(self, key, status):
+        ticket = Ticket.objects.create(
+            user=self.user, jira_id=key, key=key, title=key, status=status, issue_type='Task',
+            url=f'https://jira.local/browse/{key}',
+            created_at_jira=self.since, updated_at_jira=self.since,
+        )
+        Commit.objects.create(
+            user=self.user, repository=self.repository, ticket=ticket, sha=key.ljust(40, '0'),
+            message=f'{key} fix', author_name='dev', author_email='dev@local.dev',
+            url=f'https://github.com/org/repo/commit/{key}',
+            committed_at=datetime(2026, 10, 14, 12, 0, tzinfo=dt_timezone.utc),
+        )
+        return ticket
+
+    def test_fast_win_counts_as_fast_wins(self):
+        self._ticket_with_commit('PROJ-1', 'Done')
+
+        effort = self.service.get_effort_analysis_summary(self.since, self.until)
+
+        self.assertEqual(effort['summary']['fast_wins_count'], 1)
+        self.assertEqual(effort['details']['fast_wins'][0]['key'], 'PROJ-1')
+
+
+class CalculateStatsTests(TestCase):
+    """Aggregate stats for a report's date range."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='dev@local.dev', username='dev')
+        self.since, self.until = week_bounds(date(2026, 10, 14))
+        self.service = ReportService(self.user)
+
+    def _ticket(self, key):
+        return Ticket.objects.create(
+            user=self.user, jira_id=key, key=key, title=key, status='In Progress',
+            issue_type='Task', url=f'https://jira.local/browse/{key}',
+            created_at_jira=self.since, updated_at_jira=self.since,
+        )
+
+    def _status_change(self, ticket, to_status):
+        TicketActivity.objects.create(
+            user=self.user, ticket=ticket, activity_type='status_change', author='dev',
+            from_status='In Progress', to_status=to_status, jira_id=f'{ticket.key}-{to_status}',
+            activity_at=datetime(2026, 10, 14, 12, 0, tzinfo=dt_timezone.utc),
+        )
+
+    def _stats(self):
+        facts = self.service.analytics_service.build_ticket_facts(self.since, self.until)
+        return self.service._calculate_stats(self.since, self.until, facts, unlinked_commits=0)
+
+    def test_completed_tickets_match_done_statuses_exactly(self):
+        self._status_change(self._ticket('PROJ-1'), 'Done')
+        self._status_change(self._ticket('PROJ-2'), 'CLOSED')
+        self._status_change(self._ticket('PROJ-3'), 'Not Done')
+        self._status_change(self._ticket('PROJ-4'), 'Undone')
+
+        self.assertEqual(self._stats()['tickets_completed'], 2)
+
+    def test_non_code_activities_are_status_changes_without_commits_in_range(self):
+        repository = Repository.objects.create(
+            user=self.user, github_id=1, name='repo', full_name='org/repo',
+            url='https://github.com/org/repo',
+        )
+        coded, uncoded, coded_earlier = (self._ticket(key) for key in ('PROJ-1', 'PROJ-2', 'PROJ-3'))
+        for ticket, committed_at in (
+            (coded, datetime(2026, 10, 14, 9, 0, tzinfo=dt_timezone.utc)),
+            (coded_earlier, datetime(2026, 10, 1, 9, 0, tzinfo=dt_timezone.utc)),
+        ):
+            Commit.objects.create(
+                user=self.user, repository=repository, ticket=ticket,
+                sha=ticket.key.ljust(40, '0'), message=f'{ticket.key} fix',
+                author_name='dev', author_email='dev@local.dev',
+                url=f'https://github.com/org/repo/commit/{ticket.key}', committed_at=committed_at,
+            )
+        for ticket in (coded, uncoded, coded_earlier):
+            self._status_change(ticket, 'In Review')
+
+        self.assertEqual(self._stats()['non_code_activities'], 2)
+
+
+@patch.object(AIService, 'generate_work_summary', AsyncMock(return_value='Summary'))
+class WeekReportETagTests(TestCase):
+    """Conditional GETs on the current week report."""
+
+    url = '/api/reports/weekly/current/'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email='dev@local.dev', username='dev')
+        self.client = APIClient(HTTP_X_USER_ID=str(self.user.id))
+
+    def test_unchanged_report_returns_304(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_data_change_invalidates_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        bump_report_cache_version(self.user)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class HygieneSummaryCacheTests(TestCase):
+    """Cached hygiene summaries follow alert resolution."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email='dev@local.dev', username='dev')
+        self.client = APIClient(HTTP_X_USER_ID=str(self.user.id))
+        self.alert = HygieneAlert.objects.create(
+            user=self.user, alert_type='time_no_code', title='Time without code',
+            description='', recommendation='',
+            detected_for_start=date(2026, 10, 12), detected_for_end=date(2026, 10, 18),
+        )
+        self.params = {'since': '2026-10-12T00:00:00Z', 'until': '2026-10-18T23:59:59Z'}
+
+    def test_resolving_alerts_refreshes_summary(self):
+        url = '/api/reports/hygiene/summary/'
+        self.assertEqual(self.client.get(url, self.params).data['total_alerts'], 1)
+
+        self.client.post(
+            '/api/reports/hygiene/resolve/', {'alert_ids': [str(self.alert.id)]}, format='json'
+        )
+
+        self.assertEqual(self.client.get(url, self.params).data['total_alerts'], 0)
+
+
+class ResolveAlertsTests(TestCase):
+    """Resolving alerts in batches."""
+
+    url = '/api/reports/hygiene/resolve/'
+
+    def setUp(self):
+        self.user = User.objects.create(email='dev@local.dev', username='dev')
+        self.other = User.objects.create(email='other@local.dev', username='other')
+        self.client = APIClient(HTTP_X_USER_ID=str(self.user.id))
+
+    def _alert(self, user):
+        return HygieneAlert.objects.create(
+            user=user, alert_type='time_no_code', title='Time without code',
+            description='', recommendation='',
+            detected_for_start=date(2026, 10, 12), detected_for_end=date(2026, 10, 18),
+        )
+
+    @patch('reports.views.RESOLVE_BATCH_SIZE', 2)
+    def test_resolves_every_batch_and_only_own_alerts(self):
+        alerts = [self._alert(self.user) for _ in range(5)]
+        foreign = self._alert(self.other)
+        alert_ids = [str(alert.id) for alert in alerts + [foreign]]
+
+        response = self.client.post(self.url, {'alert_ids': alert_ids}, format='json')
+
+        self.assertEqual(response.data['resolved_count'], 5)
+        self.assertFalse(HygieneAlert.objects.filter(user=self.user, is_resolved=False).exists())
+        foreign.refresh_from_db()
+        self.assertFalse(foreign.is_resolved)
+
+
+def _report_data(summary):
+    return {
+        'stats': {
+            'total_tickets': 0, 'total_commits': 0, 'tickets_completed': 0,
+            'total_time_logged_seconds': 0, 'unlinked_commits': 0, 'non_code_activities': 0,
+        },
+        'summary': summary,
+        'markdown': summary,
+    }
+
+
+class StoredReportTests(TestCase):
+    """Stored weekly reports and their cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email='dev@local.dev', username='dev')
+        self.since, self.until = week_bounds(date(2026, 10, 14))
+        self.service = ReportService(self.user)
+
+    def _stored_summary(self):
+        report_data = self.service.get_stored_report_data(self.since.date(), self.until.date())
+        return report_data and report_data['summary']
+
+    def test_synced_report_replaces_cached_data(self):
+        self.service.store_weekly_report(self.since, self.until, _report_data('first'), synced=True)
+        self.assertEqual(self._stored_summary(), 'first')
+
+        self.service.store_weekly_report(self.since, self.until, _report_data('second'), synced=True)
+
+        self.assertEqual(self._stored_summary(), 'second')
+
+    def test_unsynced_report_does_not_replace_stored_report(self):
+        self.service.store_weekly_report(self.since, self.until, _report_data('synced'), synced=True)
+        self.service.store_weekly_report(self.since, self.until, _report_data('unsynced'))
+
+        self.assertEqual(self._stored_summary(), 'synced')
+
+    def test_deleted_report_is_not_served_from_cache(self):
+        self.service.store_weekly_report(self.since, self.until, _report_data('first'), synced=True)
+        self.assertEqual(self._stored_summary(), 'first')
+
+        WeeklyReport.objects.filter(user=self.user).delete()
+
+        self.assertIsNone(self._stored_summary())
+
+
+class WeeklyReportTaskTests(TestCase):
+    """generate_weekly_report_for_user idempotency."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email='dev@local.dev', username='dev')
+        self.since, self.until = week_bounds(timezone.now().date(), offset_weeks=-1)
+
+    def _run_task(self):
+        return generate_weekly_report_for_user.apply(args=[str(self.user.id)]).get()
+
+    def test_skips_week_with_synced_report(self):
+        stored = ReportService(self.user).store_weekly_report(
+            self.since, self.until, _report_data('synced'), synced=True
+        )
+
+        with patch.object(ReportService, 'create_weekly_report') as create:
+            self.assertEqual(self._run_task(), str(stored.id))
+
+        create.assert_not_called()
+
+    def test_regenerates_week_with_unsynced_report(self):
+        ReportService(self.user).store_weekly_report(self.since, self.until, _report_data('unsynced'))
+
+        with patch.object(ReportService, 'create_weekly_report') as create:
+            self._run_task()
+
+        create.assert_called_once()
+
+
+class GenerateAllWeeklyReportsTests(TestCase):
+    """generate_all_weekly_reports dispatches users in chunks."""
+
+    def setUp(self):
+        for i in range(5):
+            User.objects.create(
+                email=f'dev{i}@local.dev', username=f'dev{i}', github_connected=True
+            )
+        User.objects.create(email='idle@local.dev', username='idle')
+
+    @patch('reports.tasks.USER_DISPATCH_CHUNK_SIZE', 2)
+    def test_one_group_per_chunk(self):
+        with patch('reports.tasks.group') as group:
+            result = generate_all_weekly_reports()
+
+        self.assertEqual(
+            [len(list(call.args[0])) for call in group.call_args_list], [2, 2, 1]
+        )
+        self.assertEqual(group.return_value.apply_async.call_count, 3)
+        self.assertEqual(result, 'Queued reports for 5 users')
+
+
+class ParseIsoDatetimeTests(SimpleTestCase):
+    """parse_iso_datetime for query parameters."""
+
+    def test_trailing_z_is_utc(self):
+        value, error = parse_iso_datetime('2026-10-12T08:30:00Z')
+
+        self.assertIsNone(error)
+        self.assertEqual(value, datetime(2026, 10, 12, 8, 30, tzinfo=dt_timezone.utc))
+
+    def test_invalid_value_returns_error(self):
+        value, error = parse_iso_datetime('next tuesday')
+
+        self.assertIsNone(value)
+        self.assertTrue(error)
+
+
+class WeekBoundsTests(SimpleTestCase):
+    """week_bounds for the current and previous weeks."""
+
+    def test_last_week(self):
+        tz = timezone.get_current_timezone()
+
+        since, until = week_bounds(date(2026, 10, 14), offset_weeks=-1)
+
+        self.assertEqual(since, datetime(2026, 10, 5, tzinfo=tz))
+        self.assertEqual(until, datetime(2026, 10, 11, 23, 59, 59, 999999, tzinfo=tz))
+        self.assertEqual(week_bounds(date(2026, 10, 14))[0], datetime(2026, 10, 12, tzinfo=tz))
+
+    def test_last_week_across_year_boundary(self):
+        tz = timezone.get_current_timezone()
+
+        since, until = week_bounds(date(2026, 1, 1), offset_weeks=-1)
+
+        self.assertEqual(since, datetime(2025, 12, 22, tzinfo=tz))
+        self.assertEqual(until, datetime(2025, 12, 28, 23, 59, 59, 999999, tzinfo=tz))
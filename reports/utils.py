@@ -0,0 +1,46 @@
+"""
+Helpers shared by the report views, services and tasks.
+"""
+
+from datetime import date, datetime, timedelta, tzinfo
+from functools import lru_cache
+from typing import Optional, Tuple
+from django.utils import timezone
+
+# Lowercased Jira statuses that count a ticket as completed
+DONE_STATUSES = frozenset(['done', 'closed', 'resolved', 'complete', 'completed'])
+
+
+def parse_iso_datetime(value: str) -> Tuple[Optional[datetime], Optional[str]]:
+    """
+    Parse an ISO 8601 timestamp, accepting a trailing 'Z' for UTC.
+    
+    Returns (datetime, None) on success or (None, error message) otherwise.
+    """
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(value), None
+    except ValueError as e:
+        return None, str(e)
+
+
+def week_bounds(today: date, offset_weeks: int = 0) -> Tuple[datetime, datetime]:
+    """
+    Get the Monday-to-Sunday bounds of the week containing today.
+    
+    offset_weeks shifts the week (-1 for last week). Returns aware datetimes
+    from Monday 00:00 to Sunday 23:59:59.999999 in the current timezone.
+    """
+    return _week_bounds(today.toordinal(), offset_weeks, timezone.get_current_timezone())
+
+
+@lru_cache(maxsize=8)
+def _week_bounds(ordinal: int, offset_weeks: int, tz: tzinfo) -> Tuple[datetime, datetime]:
+    today = date.fromordinal(ordinal)
+    start = today - timedelta(days=today.weekday(), weeks=-offset_weeks)
+    end = start + timedelta(days=6)
+    return (
+        datetime(start.year, start.month, start.day, tzinfo=tz),
+        datetime(end.year, end.month, end.day, 23, 59, 59, 999999, tzinfo=tz),
+    )
@@ -2,24 +2,82 @@
 API views for reports and analytics.
 """
 
+import hashlib
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from rest_framework import status, views, generics
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
 from core.models import WeeklyReport, HygieneAlert
-from core.utils import get_or_create_session_user
+from core.utils import (
+    REPORT_CACHE_TIMEOUT, get_or_create_session_user, get_report_cache_version,
+    bump_report_cache_version, report_cache_key
+)
 from .serializers import (
     WeeklyReportSerializer, WeeklyReportListSerializer,
     HygieneAlertSerializer, GenerateReportRequestSerializer,
     ResolveAlertSerializer
 )
+from .pagination import HygieneAlertCursorPagination, WeeklyReportCursorPagination
 from .services import ReportService, AnalyticsService
+from .utils import parse_iso_datetime, week_bounds
 
 logger = logging.getLogger(__name__)
 
+# Alerts resolved per UPDATE in ResolveAlertsView
+RESOLVE_BATCH_SIZE = 1000
+
+
+def _parse_date_range(request):
+    """
+    Read the since/until query params as datetimes.
+    
+    Returns (since, until, None) or (None, None, error message).
+    """
+    since = request.query_params.get('since')
+    until = request.query_params.get('until')
+    
+    if not since or not until:
+        return None, None, 'since and until parameters are required'
+    
+    since_dt, error = parse_iso_datetime(since)
+    if error:
+        return None, None, error
+    
+    until_dt, error = parse_iso_datetime(until)
+    if error:
+        return None, None, error
+    
+    return since_dt, until_dt, None
+
+
+def _cached_for_range(user, name: str, since: datetime, until: datetime, compute):
+    """
+    Return compute(since, until), cached until the user's report data changes.
+    
+    Syncs, hygiene detection and alert resolution bump the user's report
+    cache version, so polling dashboards recompute only after new data.
+    """
+    key = report_cache_key(user, name, since, until)
+    result = cache.get(key)
+    if result is None:
+        result = compute(since, until)
+        cache.set(key, result, REPORT_CACHE_TIMEOUT)
+    return result
+
+
+def _report_etag(user, since: datetime, until: datetime) -> str:
+    """ETag for a user's report, changing whenever their report data does."""
+    version = get_report_cache_version(user)
+    key = f"{user.id}:{version}:{since.isoformat()}:{until.isoformat()}"
+    return quote_etag(hashlib.blake2b(key.encode(), digest_size=16).hexdigest())
+
 
 class GenerateReportView(views.APIView):
     """Generate a work report for a date range."""
@@ -33,14 +91,15 @@ class GenerateReportView(views.APIView):
         try:
             user = get_or_create_session_user(request)
             service = ReportService(user)
+            report_request = serializer.to_request()
             report = service.generate_report(
-                since=serializer.validated_data['since'],
-                until=serializer.validated_data['until'],
-                sync_first=serializer.validated_data.get('sync_first', True),
+                since=report_request.since,
+                until=report_request.until,
+                sync_first=report_request.sync_first,
             )
             return Response(report)
-        except Exception as e:
-            logger.exception(f"Error generating report: {e}")
+        except Exception:
+            logger.exception("Error generating report")
             return Response(
                 {'error': 'Failed to generate report'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -51,10 +110,14 @@ class WeeklyReportsListView(generics.ListAPIView):
     """List all weekly reports."""
     permission_classes = [AllowAny]
     serializer_class = WeeklyReportListSerializer
+    pagination_class = WeeklyReportCursorPagination
     
     def get_queryset(self):
         user = get_or_create_session_user(self.request)
-        return WeeklyReport.objects.filter(user=user)
+        # Skip the report_data/markdown blobs the list serializer doesn't show
+        return WeeklyReport.objects.filter(user=user).only(
+            *WeeklyReportListSerializer.Meta.fields
+        )
 
 
 class WeeklyReportDetailView(generics.RetrieveAPIView):
@@ -79,16 +142,17 @@ class CreateWeeklyReportView(views.APIView):
         try:
             user = get_or_create_session_user(request)
             service = ReportService(user)
+            report_request = serializer.to_request()
             report = service.create_weekly_report(
-                start_date=serializer.validated_data['since'],
-                end_date=serializer.validated_data['until'],
+                start_date=report_request.since,
+                end_date=report_request.until,
             )
             return Response(
                 WeeklyReportSerializer(report).data,
                 status=status.HTTP_201_CREATED
             )
-        except Exception as e:
-            logger.exception(f"Error creating weekly report: {e}")
+        except Exception:
+            logger.exception("Error creating weekly report")
             return Response(
                 {'error': 'Failed to create weekly report'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -100,22 +164,24 @@ class CurrentWeekReportView(views.APIView):
     permission_classes = [AllowAny]
     
     def get(self, request):
-        # Calculate current week bounds (Monday to Sunday)
-        today = timezone.now().date()
-        start_of_week = today - timedelta(days=today.weekday())
-        end_of_week = start_of_week + timedelta(days=6)
-        
-        # Convert to datetime
-        since = timezone.make_aware(datetime.combine(start_of_week, datetime.min.time()))
-        until = timezone.make_aware(datetime.combine(end_of_week, datetime.max.time()))
+        # Current week bounds (Monday to Sunday)
+        since, until = week_bounds(timezone.now().date())
         
         try:
             user = get_or_create_session_user(request)
+            
+            etag = _report_etag(user, since, until)
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified['ETag'] = etag
+                return not_modified
+            
             service = ReportService(user)
             report = service.generate_report(since, until, sync_first=False)
-            return Response(report)
-        except Exception as e:
-            logger.exception(f"Error getting current week report: {e}")
+            # Generating can record new hygiene alerts, which moves the version on
+            return Response(report, headers={'ETag': _report_etag(user, since, until)})
+        except Exception:
+            logger.exception("Error getting current week report")
             return Response(
                 {'error': 'Failed to get current week report'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -129,30 +195,29 @@ class LastWeekReportView(views.APIView):
     def get(self, request):
         user = get_or_create_session_user(request)
         
-        # Calculate last week bounds
-        today = timezone.now().date()
-        start_of_last_week = today - timedelta(days=today.weekday() + 7)
-        end_of_last_week = start_of_last_week + timedelta(days=6)
+        # Last week bounds
+        since, until = week_bounds(timezone.now().date(), offset_weeks=-1)
         
-        since = timezone.make_aware(datetime.combine(start_of_last_week, datetime.min.time()))
-        until = timezone.make_aware(datetime.combine(end_of_last_week, datetime.max.time()))
+        etag = _report_etag(user, since, until)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
         
         # Check if we have a stored report
-        existing = WeeklyReport.objects.filter(
-            user=user,
-            start_date=start_of_last_week,
-            end_date=end_of_last_week,
-        ).first()
+        service = ReportService(user)
+        stored_report = service.get_stored_report_data(since.date(), until.date())
         
-        if existing:
-            return Response(existing.report_data)
+        if stored_report is not None:
+            return Response(stored_report, headers={'ETag': etag})
         
         try:
-            service = ReportService(user)
             report = service.generate_report(since, until, sync_first=False)
-            return Response(report)
-        except Exception as e:
-            logger.exception(f"Error getting last week report: {e}")
+            # Last week is over, so keep the result for the next request
+            service.store_weekly_report(since, until, report)
+            return Response(report, headers={'ETag': _report_etag(user, since, until)})
+        except Exception:
+            logger.exception("Error getting last week report")
             return Response(
                 {'error': 'Failed to get last week report'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -166,27 +231,21 @@ class EffortAnalysisView(views.APIView):
     permission_classes = [AllowAny]
     
     def get(self, request):
-        since = request.query_params.get('since')
-        until = request.query_params.get('until')
-        
-        if not since or not until:
-            return Response(
-                {'error': 'since and until parameters are required'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        since_dt, until_dt, error = _parse_date_range(request)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            since_dt = datetime.fromisoformat(since.replace('Z', '+00:00'))
-            until_dt = datetime.fromisoformat(until.replace('Z', '+00:00'))
-            
             user = get_or_create_session_user(request)
-            service = AnalyticsService(user)
-            analysis = service.get_effort_analysis_summary(since_dt, until_dt)
+            analysis = _cached_for_range(
+                user, 'effort', since_dt, until_dt,
+                AnalyticsService(user).get_effort_analysis_summary,
+            )
             return Response(analysis)
         except ValueError as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            logger.exception(f"Error getting effort analysis: {e}")
+        except Exception:
+            logger.exception("Error getting effort analysis")
             return Response(
                 {'error': 'Failed to get effort analysis'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -199,10 +258,12 @@ class HygieneAlertsView(generics.ListAPIView):
     """List hygiene alerts."""
     permission_classes = [AllowAny]
     serializer_class = HygieneAlertSerializer
+    pagination_class = HygieneAlertCursorPagination
     
     def get_queryset(self):
         user = get_or_create_session_user(self.request)
-        queryset = HygieneAlert.objects.filter(user=user)
+        # The serializer reads ticket.key and commit.sha
+        queryset = HygieneAlert.objects.filter(user=user).select_related('ticket', 'commit')
         
         # Filter by resolved status
         resolved = self.request.query_params.get('resolved')
@@ -227,27 +288,21 @@ class HygieneSummaryView(views.APIView):
     permission_classes = [AllowAny]
     
     def get(self, request):
-        since = request.query_params.get('since')
-        until = request.query_params.get('until')
-        
-        if not since or not until:
-            return Response(
-                {'error': 'since and until parameters are required'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        since_dt, until_dt, error = _parse_date_range(request)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            since_dt = datetime.fromisoformat(since.replace('Z', '+00:00'))
-            until_dt = datetime.fromisoformat(until.replace('Z', '+00:00'))
-            
             user = get_or_create_session_user(request)
-            service = AnalyticsService(user)
-            summary = service.get_hygiene_summary(since_dt, until_dt)
+            summary = _cached_for_range(
+                user, 'hygiene', since_dt, until_dt,
+                AnalyticsService(user).get_hygiene_summary,
+            )
             return Response(summary)
         except ValueError as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            logger.exception(f"Error getting hygiene summary: {e}")
+        except Exception:
+            logger.exception("Error getting hygiene summary")
             return Response(
                 {'error': 'Failed to get hygiene summary'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -266,16 +321,22 @@ class DetectHygieneIssuesView(views.APIView):
         try:
             user = get_or_create_session_user(request)
             service = AnalyticsService(user)
+            report_request = serializer.to_request()
             alerts = service.detect_hygiene_issues(
-                since=serializer.validated_data['since'],
-                until=serializer.validated_data['until'],
+                since=report_request.since,
+                until=report_request.until,
             )
-            return Response({
+            response_data = {
                 'message': f'Detected {len(alerts)} hygiene issues',
-                'alerts': HygieneAlertSerializer(alerts, many=True).data
-            })
-        except Exception as e:
-            logger.exception(f"Error detecting hygiene issues: {e}")
+                'count': len(alerts),
+                'alert_ids': [str(a.id) for a in alerts],
+            }
+            # Full alerts only on request; clients can page through HygieneAlertsView
+            if request.query_params.get('include') == 'full':
+                response_data['alerts'] = HygieneAlertSerializer(alerts, many=True).data
+            return Response(response_data)
+        except Exception:
+            logger.exception("Error detecting hygiene issues")
             return Response(
                 {'error': 'Failed to detect hygiene issues'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -294,14 +355,23 @@ class ResolveAlertsView(views.APIView):
         user = get_or_create_session_user(request)
         alert_ids = serializer.validated_data['alert_ids']
         
-        updated = HygieneAlert.objects.filter(
-            user=user,
-            id__in=alert_ids,
-            is_resolved=False,
-        ).update(
-            is_resolved=True,
-            resolved_at=timezone.now()
-        )
+        resolved_at = timezone.now()
+        updated = 0
+        
+        # Resolve in fixed-size batches so each UPDATE keeps a small IN list
+        with transaction.atomic():
+            for i in range(0, len(alert_ids), RESOLVE_BATCH_SIZE):
+                updated += HygieneAlert.objects.filter(
+                    user=user,
+                    id__in=alert_ids[i:i + RESOLVE_BATCH_SIZE],
+                    is_resolved=False,
+                ).update(
+                    is_resolved=True,
+                    resolved_at=resolved_at
+                )
+        
+        if updated:
+            bump_report_cache_version(user)
         
         return Response({
             'message': f'Resolved {updated} alerts',